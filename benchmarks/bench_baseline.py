@@ -0,0 +1,70 @@
+"""Benchmark the per-ticker z-score comparison of today's activity against the trailing baseline.
+
+Daily rollups are seeded by upserting one buy and one sale for each day a
+ticker is active (an `--activity` fraction of ticker-days, spread evenly),
+then the comparison over the whole ticker universe is timed.
+
+Usage: python benchmarks/bench_baseline.py [--tickers 5000] [--days 90] [--activity 0.1]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from data.storage import DataStorage
+from tools.baseline_comparison import compare_to_baseline
+
+
+def generate_trades(tickers: int, days: int, as_of: date, activity: float):
+    for day in range(days + 1):
+        transaction_date = (as_of - timedelta(days=days - day)).isoformat()
+        for i in range(tickers):
+            if (i * 7919 + day * 104729) % 1000 >= activity * 1000:
+                continue
+            for line, (transaction_type, value) in enumerate((('Purchase', 1000 + (i * day) % 5000),
+                                                               ('Sale', 2000 + (i + day) % 7000))):
+                yield {
+                    'company': f"Company {i}",
+                    'ticker': f"T{i}",
+                    'insider_name': f"Insider {i}",
+                    'title': 'Director',
+                    'transaction_date': transaction_date,
+                    'transaction_type': transaction_type,
+                    'shares': 100,
+                    'price': value / 100,
+                    'value': value,
+                    'accession_number': f"{i:010d}-{day:02d}-{line:06d}",
+                    'line_number': 1,
+                }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickers', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--activity', type=float, default=0.1, help="Fraction of days each ticker trades on")
+    args = parser.parse_args()
+
+    as_of = date(2024, 6, 28)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.PARQUET_ENABLED = False
+        storage = DataStorage(db_path=Path(tmp_dir) / "bench.db")
+
+        start = time.perf_counter()
+        written = storage.bulk_upsert_trades(generate_trades(args.tickers, args.days, as_of, args.activity))
+        print(f"Seeded {written:,} trades in {time.perf_counter() - start:.1f}s")
+
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            comparison = compare_to_baseline(as_of.isoformat(), args.days, storage=storage)
+            elapsed = time.perf_counter() - start
+            print(f"[{label}] Compared {len(comparison):,} active tickers against a {args.days}-day baseline "
+                  f"in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
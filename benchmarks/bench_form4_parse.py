@@ -0,0 +1,107 @@
+"""Benchmark Form 4 parsing throughput from 1 to N worker processes.
+
+A synthetic fixture corpus of Form 4 submissions is written to a temporary
+directory and parsed once per worker count.
+
+Usage: python benchmarks/bench_form4_parse.py [--documents 5000] [--max-workers 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.form4_pipeline import parse_documents
+
+TRANSACTION = """
+<nonDerivativeTransaction>
+<securityTitle><value>Common Stock</value></securityTitle>
+<transactionDate><value>2024-01-{day:02d}</value></transactionDate>
+<transactionCoding><transactionFormType>4</transactionFormType><transactionCode>{code}</transactionCode></transactionCoding>
+<transactionAmounts>
+<transactionShares><value>{shares}</value></transactionShares>
+<transactionPricePerShare><value>{price:.2f}</value></transactionPricePerShare>
+<transactionAcquiredDisposedCode><value>{ad}</value></transactionAcquiredDisposedCode>
+</transactionAmounts>
+<postTransactionAmounts><sharesOwnedFollowingTransaction><value>{after}</value></sharesOwnedFollowingTransaction></postTransactionAmounts>
+<ownershipNature><directOrIndirectOwnership><value>D</value></directOrIndirectOwnership></ownershipNature>
+</nonDerivativeTransaction>"""
+
+DOCUMENT = """<SEC-DOCUMENT>{accession}.txt
+<DOCUMENT>
+<TYPE>4
+<TEXT>
+<XML>
+<?xml version="1.0"?>
+<ownershipDocument>
+<schemaVersion>X0306</schemaVersion>
+<documentType>4</documentType>
+<periodOfReport>2024-01-02</periodOfReport>
+<issuer><issuerCik>{cik:010d}</issuerCik><issuerName>Company {cik}</issuerName><issuerTradingSymbol>T{cik}</issuerTradingSymbol></issuer>
+<reportingOwner>
+<reportingOwnerId><rptOwnerCik>{owner:010d}</rptOwnerCik><rptOwnerName>Insider {owner}</rptOwnerName></reportingOwnerId>
+<reportingOwnerRelationship><isOfficer>1</isOfficer><officerTitle>Chief Financial Officer</officerTitle></reportingOwnerRelationship>
+</reportingOwner>
+<nonDerivativeTable>{transactions}
+</nonDerivativeTable>
+<footnotes><footnote id="F1">Weighted average price.</footnote></footnotes>
+</ownershipDocument>
+</XML>
+</TEXT>
+</DOCUMENT>
+</SEC-DOCUMENT>
+"""
+
+
+def write_corpus(directory: Path, documents: int, rows: int) -> None:
+    for i in range(documents):
+        transactions = "".join(
+            TRANSACTION.format(
+                day=1 + (i + j) % 28,
+                code='S' if j % 2 else 'P',
+                ad='D' if j % 2 else 'A',
+                shares=100 * (j + 1),
+                price=10 + (i % 500) / 7,
+                after=10_000 + j,
+            )
+            for j in range(rows)
+        )
+        accession = f"0000000000-24-{i:06d}"
+        body = DOCUMENT.format(accession=accession, cik=1000 + i % 900, owner=5000 + i, transactions=transactions)
+        (directory / f"{accession}.txt").write_text(body)
+
+
+def load_corpus(directory: Path):
+    for path in sorted(directory.glob("*.txt")):
+        yield path.read_bytes(), path.stem, "2024-01-02"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=4, help="Transactions per document")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = Path(tmp_dir)
+        write_corpus(corpus, args.documents, args.rows)
+
+        workers = 1
+        baseline = None
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            trades = sum(1 for _ in parse_documents(load_corpus(corpus), workers, args.chunk_size))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {args.documents} docs, {trades} trades in {elapsed:.2f}s "
+                  f"({args.documents / elapsed:,.0f} docs/s, speedup {baseline / elapsed:.2f}x)")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark rendering the HTML report for a large number of transactions.
+
+The report is streamed to a temporary file section by section. Peak Python
+memory is measured with tracemalloc in a second pass, which shows that the
+document is never held in memory as a whole.
+
+Usage: python benchmarks/bench_report.py [--trades 100000] [--page-size 500]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.report_renderer import iter_report_html, write_report
+
+
+def generate_trades(count: int):
+    types = ('Purchase', 'Sale', 'Grant', 'Option Exercise')
+    trades = []
+    for i in range(count):
+        shares = 100 + i % 5000
+        price = 5 + (i % 1000) / 10
+        trades.append({
+            'company': f"Company {i % 4000} & Sons",
+            'ticker': f"T{i % 4000}",
+            'insider_name': f"Insider {i % 25000}",
+            'title': 'Director',
+            'transaction_date': '2024-01-02',
+            'transaction_type': types[i % 4],
+            'shares': shares,
+            'price': price,
+            'value': shares * price,
+        })
+    return trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trades', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args()
+
+    trades = generate_trades(args.trades)
+    filings = [{'company': f"Company {i}", 'form': '4', 'filing_date': '2024-01-02'} for i in range(1000)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "report.html"
+        start = time.perf_counter()
+        write_report(path, iter_report_html(filings, trades, "chart.html", page_size=args.page_size))
+        elapsed = time.perf_counter() - start
+        size_mb = path.stat().st_size / 1e6
+
+        # Second pass under tracemalloc, which would otherwise distort the timing
+        tracemalloc.start()
+        write_report(path, iter_report_html(filings, trades, "chart.html", page_size=args.page_size))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"Rendered {args.trades:,} transactions in {elapsed:.2f}s "
+          f"({args.trades / elapsed:,.0f} rows/s, report {size_mb:.1f} MB, peak memory {peak / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark the EDGAR fetcher against a local stub HTTP server.
+
+The stub answers conditional requests with 304, so the second (warm) pass
+shows the effect of the on-disk HTTP cache.
+
+Usage: python benchmarks/bench_sec_fetcher.py [--requests 200] [--latency 0.05]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data.http_cache import HTTPCache
+from tools.sec_fetcher import EdgarFetcher
+from utils.rate_limiter import TokenBucket
+
+
+def make_handler(latency: float):
+    payload = json.dumps({
+        'name': 'Stub Co',
+        'filings': {'recent': {'form': ['4'] * 500, 'filingDate': ['2024-01-02'] * 500}},
+    }).encode()
+    etag = '"stub-v1"'
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help="Simulated server latency (seconds)")
+    parser.add_argument('--rate', type=float, default=10.0, help="Requests per second ceiling")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    cache_dir = tempfile.TemporaryDirectory()
+    cache = HTTPCache(db_path=Path(cache_dir.name) / "http_cache.db")
+    fetcher = EdgarFetcher(max_concurrency=args.concurrency, rate_limiter=TokenBucket(args.rate), cache=cache)
+    urls = [f"{base_url}/submissions/CIK{cik:010d}.json" for cik in range(args.requests)]
+
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        responses = fetcher.get_many(urls)
+        elapsed = time.perf_counter() - start
+
+        ok = sum(1 for r in responses if r.ok)
+        cached = sum(1 for r in responses if r.from_cache)
+        print(f"[{label}] Fetched {ok}/{args.requests} ({cached} from cache) in {elapsed:.2f}s "
+              f"({args.requests / elapsed:.2f} req/s, ceiling {args.rate:.2f} req/s)")
+
+    serial_estimate = args.requests * (args.latency + 0.1)
+    print(f"Serial requests.get + sleep(0.1) estimate: {serial_estimate:.2f}s")
+    print(f"Cache stats: {cache.stats()}")
+
+    fetcher.close()
+    server.shutdown()
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
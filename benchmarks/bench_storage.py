@@ -0,0 +1,65 @@
+"""Benchmark bulk upserts of insider trades into SQLite.
+
+Trades are produced by a generator, so the benchmark also shows that the
+bulk path streams rows without materializing them. The second pass
+re-upserts the same trades, as a re-run of the same hour would.
+
+Usage: python benchmarks/bench_storage.py [--trades 1000000] [--chunk-size 10000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from data.storage import DataStorage
+
+
+def generate_trades(count: int):
+    types = ('Purchase', 'Sale', 'Grant', 'Option Exercise')
+    companies = [(f"Company {i}", f"T{i}") for i in range(4000)]
+    insiders = [f"Insider {i}" for i in range(25000)]
+    dates = [f"2024-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)]
+    for i in range(count):
+        company, ticker = companies[i % 4000]
+        shares = 100 + i % 5000
+        price = 5 + (i % 1000) / 10
+        yield {
+            'company': company,
+            'ticker': ticker,
+            'insider_name': insiders[i % 25000],
+            'title': 'Director',
+            'transaction_date': dates[i % len(dates)],
+            'transaction_type': types[i % 4],
+            'shares': shares,
+            'price': price,
+            'value': shares * price,
+            'accession_number': f"0000000000-24-{i // 4:06d}",
+            'line_number': 1 + i % 4,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trades', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.PARQUET_DIR = Path(tmp_dir) / "trades_parquet"
+        storage = DataStorage(db_path=Path(tmp_dir) / "bench.db")
+
+        for label in ("insert", "re-run"):
+            start = time.perf_counter()
+            written = storage.bulk_upsert_trades(generate_trades(args.trades), chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - start
+            size_mb = storage.db_path.stat().st_size / 1e6
+
+            print(f"[{label}] Upserted {written:,} trades in {elapsed:.2f}s "
+                  f"({written / elapsed:,.0f} rows/s, db {size_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,102 @@ class Settings:
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
     LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gpt-4o-mini")
     
+    # Content-addressed LLM response cache (stored under DATA_DIR)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    
+    # Artifact store for data passed between flow steps (stored under DATA_DIR)
+    ARTIFACT_SUMMARY_TOP_N = int(os.getenv("ARTIFACT_SUMMARY_TOP_N", "5"))
+    ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "7"))
+    
+    # Per-step flow checkpoints for --resume (stored under DATA_DIR)
+    CHECKPOINT_MAX_AGE_DAYS = float(os.getenv("CHECKPOINT_MAX_AGE_DAYS", "7"))
+    
+    # Flow mode: "fast" calls the tools directly, "agents" routes every step through an LLM crew
+    FLOW_MODE = os.getenv("FLOW_MODE", "fast")
+    FLOW_NARRATIVE = os.getenv("FLOW_NARRATIVE", "false").lower() == "true"
+    
     # SEC Configuration
     SEC_USER_AGENT = os.getenv("SEC_USER_AGENT", "your_email@example.com")
     SEC_BASE_URL = "https://www.sec.gov"
     SEC_EDGAR_URL = "https://data.sec.gov"
+
+    # SEC HTTP client (fair-access policy allows at most 10 requests/second)
+    SEC_REQUESTS_PER_SECOND = float(os.getenv("SEC_REQUESTS_PER_SECOND", "10"))
+    SEC_RATE_BURST = float(os.getenv("SEC_RATE_BURST", "1"))
+    SEC_MAX_CONCURRENCY = int(os.getenv("SEC_MAX_CONCURRENCY", "8"))
+    SEC_REQUEST_TIMEOUT = float(os.getenv("SEC_REQUEST_TIMEOUT", "30"))
+    SEC_MAX_RETRIES = int(os.getenv("SEC_MAX_RETRIES", "5"))
+    SEC_BACKOFF_BASE = float(os.getenv("SEC_BACKOFF_BASE", "1"))
+    SEC_BACKOFF_MAX = float(os.getenv("SEC_BACKOFF_MAX", "60"))
+
+    # Filing discovery: "index" reads EDGAR form indexes, "submissions" probes CIKs
+    SEC_INGEST_MODE = os.getenv("SEC_INGEST_MODE", "index")
+    SEC_INDEX_DAILY_MAX_DAYS = int(os.getenv("SEC_INDEX_DAILY_MAX_DAYS", "10"))
+
+    # Form 4 ingestion (0 = no limit on filings per run; 0 parse workers = parse in a thread)
+    FORM4_MAX_FILINGS = int(os.getenv("FORM4_MAX_FILINGS", "0"))
+    FORM4_PARSE_WORKERS = int(os.getenv("FORM4_PARSE_WORKERS", str(os.cpu_count() or 1)))
+    FORM4_PARSE_CHUNK_SIZE = int(os.getenv("FORM4_PARSE_CHUNK_SIZE", "50"))
+
+    # Daemon mode: poll the latest-filings feed from a persisted high-water mark
+    DAEMON_POLL_INTERVAL = float(os.getenv("DAEMON_POLL_INTERVAL", "60"))
+    DAEMON_FEED_PAGE_SIZE = int(os.getenv("DAEMON_FEED_PAGE_SIZE", "100"))
+    DAEMON_MAX_FEED_PAGES = int(os.getenv("DAEMON_MAX_FEED_PAGES", "10"))
+    DAEMON_INITIAL_LOOKBACK_HOURS = int(os.getenv("DAEMON_INITIAL_LOOKBACK_HOURS", "24"))
+    DAEMON_MAX_FILING_RETRIES = int(os.getenv("DAEMON_MAX_FILING_RETRIES", "5"))
     
+    # Historical backfill: "day" or "quarter" shards processed by a pool of workers
+    BACKFILL_SHARD = os.getenv("BACKFILL_SHARD", "day")
+    BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "4"))
+    BACKFILL_BATCH_FILINGS = int(os.getenv("BACKFILL_BATCH_FILINGS", "1000"))
+    
+    # Conditional-GET response cache for EDGAR JSON (stored under DATA_DIR)
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+    # SQLite storage tuning
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "60"))
+    STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", "10000"))
+    ROLLUP_BASELINE_DAYS = int(os.getenv("ROLLUP_BASELINE_DAYS", "90"))
+
+    # "dashboard" renders every chart into one page, "files" writes one HTML file per chart;
+    # both load a single shared copy of plotly.js from CHARTS_DIR
+    CHART_OUTPUT = os.getenv("CHART_OUTPUT", "dashboard")
+    # Bounds on chart payloads: bars shown before the rest is grouped as "Other",
+    # points kept in a time series, and log bins per factor of ten in the value histogram
+    CHART_TOP_N = int(os.getenv("CHART_TOP_N", "20"))
+    CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "500"))
+    CHART_VALUE_BINS_PER_DECADE = int(os.getenv("CHART_VALUE_BINS_PER_DECADE", "4"))
+    # Processes that render charts in parallel (0 renders in a single thread)
+    CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # Rows per page of the report's transaction table
+    REPORT_PAGE_SIZE = int(os.getenv("REPORT_PAGE_SIZE", "500"))
+
+    # Columnar Parquet copy of the trade history (requires pyarrow)
+    PARQUET_ENABLED = os.getenv("PARQUET_ENABLED", "true").lower() == "true"
+
     # File Paths
     BASE_DIR = Path(__file__).parent.parent
     OUTPUT_DIR = BASE_DIR / "output"
     REPORTS_DIR = OUTPUT_DIR / "reports"
     CHARTS_DIR = OUTPUT_DIR / "charts"
     DATA_DIR = BASE_DIR / "data"
+    PARQUET_DIR = DATA_DIR / "trades_parquet"
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
+    # "text" for colored console lines, "json" for one JSON object per line
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+    # Warnings from one call site beyond this many per window are counted, not written
+    LOG_WARNING_BURST = int(os.getenv("LOG_WARNING_BURST", "10"))
+    LOG_WARNING_WINDOW = float(os.getenv("LOG_WARNING_WINDOW", "60"))
+
     # Create directories if they don't exist
     for dir_path in [OUTPUT_DIR, REPORTS_DIR, CHARTS_DIR, DATA_DIR]:
         dir_path.mkdir(parents=True, exist_ok=True)
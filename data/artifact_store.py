@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+HANDLE_PATTERN = re.compile(r"artifact://([a-z_]+)/([0-9a-f]{16,64})")
+
+
+def summarize_trades(trades: List[Dict[str, Any]], top_n: Optional[int] = None) -> Dict[str, Any]:
+    """Fixed-size aggregates of a trade list: totals, type counts and top companies"""
+    top_n = top_n or settings.ARTIFACT_SUMMARY_TOP_N
+    company_value: Counter = Counter()
+    types: Counter = Counter()
+    total_shares = 0
+    for trade in trades:
+        company_value[trade.get('company') or 'Unknown'] += trade.get('value') or 0
+        types[trade.get('transaction_type') or 'Unknown'] += 1
+        total_shares += trade.get('shares') or 0
+
+    largest = sorted(trades, key=lambda trade: trade.get('value') or 0, reverse=True)[:top_n]
+    return {
+        'count': len(trades),
+        'total_value': round(sum(company_value.values()), 2),
+        'total_shares': total_shares,
+        'transaction_types': dict(types.most_common()),
+        'top_companies_by_value': [[company, round(value, 2)] for company, value in company_value.most_common(top_n)],
+        'largest_trades': [
+            {key: trade.get(key) for key in ('company', 'ticker', 'insider_name', 'transaction_type', 'value')}
+            for trade in largest
+        ],
+    }
+
+
+def summarize_filings(filings: List[Dict[str, Any]], top_n: Optional[int] = None) -> Dict[str, Any]:
+    """Fixed-size aggregates of a filing list: counts by form and most frequent filers"""
+    top_n = top_n or settings.ARTIFACT_SUMMARY_TOP_N
+    forms = Counter(filing.get('form') or 'Unknown' for filing in filings)
+    companies = Counter(filing.get('company') or 'Unknown' for filing in filings)
+    return {
+        'count': len(filings),
+        'forms': dict(forms.most_common(top_n)),
+        'top_filers': companies.most_common(top_n),
+    }
+
+
+SUMMARIZERS = {
+    'sec_filings': summarize_filings,
+    'insider_trades': summarize_trades,
+}
+
+
+class ArtifactStore:
+    """Content-addressed store for data passed between flow steps.
+
+    Tools save their full output here and hand the agents a short
+    `artifact://<kind>/<digest>` handle plus a fixed-size summary, so
+    prompts stay the same size however much data a run produces. Other
+    tools resolve the handle back to the full data locally.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or settings.DATA_DIR / "artifacts"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, kind: str, digest: str) -> Tuple[Path, Path]:
+        base = self.root / f"{kind}-{digest}"
+        return base.with_suffix('.json'), base.with_suffix('.summary.json')
+
+    def put(self, kind: str, data: Any) -> Tuple[str, Dict[str, Any]]:
+        """Save `data` and return its handle together with its summary"""
+        body = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        data_path, summary_path = self._paths(kind, digest)
+        summarizer = SUMMARIZERS.get(kind)
+        summary = summarizer(data) if summarizer else {'count': len(data) if hasattr(data, '__len__') else None}
+
+        if not data_path.exists():
+            tmp_path = data_path.with_name(f".{data_path.name}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, data_path)
+        else:
+            # prune() goes by mtime, so content still being produced must look fresh
+            os.utime(data_path)
+        summary_path.write_text(json.dumps(summary, default=str))
+        return f"artifact://{kind}/{digest}", summary
+
+    def get(self, handle: str) -> Any:
+        """Load the full data behind a handle"""
+        kind, digest = self._parse(handle)
+        data_path, _ = self._paths(kind, digest)
+        with open(data_path, 'rb') as f:
+            return json.load(f)
+
+    def summary(self, handle: str) -> Dict[str, Any]:
+        kind, digest = self._parse(handle)
+        _, summary_path = self._paths(kind, digest)
+        return json.loads(summary_path.read_text())
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """Delete artifacts not written for `max_age_days`; returns files removed"""
+        max_age_days = settings.ARTIFACT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.root.glob("*.json"):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info(f"Pruned {removed} old artifact files")
+        return removed
+
+    @staticmethod
+    def _parse(handle: str) -> Tuple[str, str]:
+        match = HANDLE_PATTERN.search(handle)
+        if not match:
+            raise ValueError(f"Not an artifact handle: {handle[:80]}")
+        return match.group(1), match.group(2)
+
+
+def find_handle(text: str) -> Optional[str]:
+    """Return the first artifact handle mentioned in `text` (e.g. an agent's answer)"""
+    match = HANDLE_PATTERN.search(text or "")
+    return match.group(0) if match else None
+
+
+_artifact_store: Optional[ArtifactStore] = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store, pruning old artifacts on first use"""
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore()
+            _artifact_store.prune()
+        return _artifact_store
+
+
+def publish(kind: str, data: Any) -> str:
+    """Store tool output and return the compact JSON reference given to agents"""
+    handle, summary = get_artifact_store().put(kind, data)
+    return json.dumps({'handle': handle, 'summary': summary}, separators=(',', ':'), default=str)
+
+
+def resolve(value: Optional[str]) -> Any:
+    """Turn a tool argument into data: a handle (or a reference containing one) is
+    loaded from the store, anything else is parsed as JSON"""
+    if not value:
+        return []
+    handle = find_handle(value)
+    if handle:
+        return get_artifact_store().get(handle)
+    return json.loads(value)
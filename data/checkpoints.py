@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+
+def new_run_id() -> str:
+    """A sortable, unique identifier for one flow run"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def input_hash(*parts: Any) -> str:
+    """Hash of everything a step reads, so a checkpoint is only reused for identical inputs"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class CheckpointStore:
+    """Per-step flow checkpoints in SQLite.
+
+    Each completed step saves the state fields it produced, keyed by run ID,
+    step name and a hash of the step's inputs. Resuming a run restores those
+    fields and skips the step; a step whose inputs changed runs again.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or settings.DATA_DIR / "checkpoints.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS flow_runs (
+                run_id TEXT PRIMARY KEY,
+                flow TEXT,
+                params TEXT,
+                created_at REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS flow_checkpoints (
+                run_id TEXT,
+                step TEXT,
+                input_hash TEXT,
+                output TEXT,
+                created_at REAL,
+                PRIMARY KEY (run_id, step)
+            )
+        """)
+        self._conn.commit()
+
+    def start_run(self, run_id: str, flow: str, params: Dict[str, Any]) -> None:
+        """Record a run and its parameters (kept as-is when the run is resumed)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO flow_runs (run_id, flow, params, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, flow, json.dumps(params), time.time())
+            )
+            self._conn.commit()
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT flow, params FROM flow_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'run_id': run_id, 'flow': row[0], 'params': json.loads(row[1])}
+
+    def save(self, run_id: str, step: str, step_input_hash: str, output: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO flow_checkpoints (run_id, step, input_hash, output, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (run_id, step, step_input_hash, json.dumps(output, default=str), time.time()))
+            self._conn.commit()
+
+    def load(self, run_id: str, step: str, step_input_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the saved output of a step, or None if it did not finish with these inputs"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT input_hash, output FROM flow_checkpoints WHERE run_id = ? AND step = ?",
+                (run_id, step)
+            ).fetchone()
+        if row is None or row[0] != step_input_hash:
+            return None
+        return json.loads(row[1])
+
+    def completed_steps(self, run_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT step FROM flow_checkpoints WHERE run_id = ? ORDER BY created_at", (run_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """Delete runs started more than `max_age_days` ago; returns runs removed"""
+        max_age_days = settings.CHECKPOINT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            old_runs = [row[0] for row in self._conn.execute(
+                "SELECT run_id FROM flow_runs WHERE created_at < ?", (cutoff,)
+            )]
+            self._conn.executemany("DELETE FROM flow_checkpoints WHERE run_id = ?", [(r,) for r in old_runs])
+            self._conn.executemany("DELETE FROM flow_runs WHERE run_id = ?", [(r,) for r in old_runs])
+            self._conn.commit()
+        if old_runs:
+            logger.info(f"Pruned checkpoints of {len(old_runs)} old runs")
+        return len(old_runs)
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store, pruning old runs on first use"""
+    global _checkpoint_store
+    with _checkpoint_store_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = CheckpointStore()
+            _checkpoint_store.prune()
+        return _checkpoint_store
@@ -0,0 +1,69 @@
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from data.sqlite_lru import SQLiteLRUCache
+from config.settings import settings
+
+
+class HTTPCache(SQLiteLRUCache):
+    """Persistent conditional-GET cache for EDGAR responses.
+
+    Responses are keyed by URL together with their ETag/Last-Modified
+    validators. Callers send the validators back as If-None-Match /
+    If-Modified-Since and serve the stored body when EDGAR answers 304.
+    Entries are evicted least-recently-used once the cache exceeds
+    `max_bytes`.
+    """
+
+    table = "http_cache"
+    columns = (('etag', 'TEXT'), ('last_modified', 'TEXT'), ('body', 'BLOB'))
+
+    def __init__(self, db_path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        super().__init__(
+            db_path or settings.DATA_DIR / "http_cache.db",
+            max_bytes or settings.HTTP_CACHE_MAX_BYTES,
+        )
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached URL"""
+        row = self._get(url, ('etag', 'last_modified'), touch=False)
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """Return the cached body after a 304, recording a hit"""
+        row = self._get(url, ('body',))
+        if row is None:
+            return None
+        self._count(hit=True)
+        return row[0]
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str]) -> None:
+        """Store a fresh 200 response, recording a miss"""
+        self._count(hit=False)
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        self._put(url, {'etag': etag, 'last_modified': last_modified, 'body': body}, len(body))
+
+
+_http_cache: Optional[HTTPCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Return the process-wide HTTP cache, or None when caching is disabled"""
+    global _http_cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HTTPCache()
+        return _http_cache
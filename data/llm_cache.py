@@ -0,0 +1,131 @@
+import functools
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from data.sqlite_lru import SQLiteLRUCache
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+# Completion parameters that change the response and therefore belong in the key
+KEY_PARAMS = (
+    'model', 'messages', 'tools', 'tool_choice', 'functions', 'temperature',
+    'top_p', 'max_tokens', 'stop', 'response_format', 'seed',
+)
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """Content address of a completion request: a hash of the prompt-affecting parameters"""
+    material = {name: params.get(name) for name in KEY_PARAMS}
+    encoded = json.dumps(material, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class LLMCache(SQLiteLRUCache):
+    """Persistent content-addressed cache for LLM completions.
+
+    Responses are stored as JSON keyed by `cache_key()`, so repeating a
+    request with the same model, messages, tools and sampling settings is
+    served locally. Entries older than `ttl` seconds are treated as misses,
+    and least-recently-used entries are evicted once the cache exceeds
+    `max_bytes`.
+    """
+
+    table = "llm_cache"
+    columns = (('model', 'TEXT'), ('response', 'TEXT'))
+
+    def __init__(self, db_path: Optional[Path] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        super().__init__(
+            db_path or settings.DATA_DIR / "llm_cache.db",
+            max_bytes or settings.LLM_CACHE_MAX_BYTES,
+            settings.LLM_CACHE_TTL_SECONDS if ttl is None else ttl,
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response for `key`, counting a hit or a miss"""
+        row = self._get(key, ('response',))
+        self._count(hit=row is not None)
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, model: Optional[str], response: Dict[str, Any]) -> None:
+        """Store a successful response under `key`"""
+        body = json.dumps(response, default=str)
+        self._put(key, {'model': model, 'response': body}, len(body.encode('utf-8')))
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the process-wide LLM cache, or None when caching is disabled"""
+    global _llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
+
+
+def _request_params(args, kwargs) -> Dict[str, Any]:
+    params = dict(zip(('model', 'messages'), args))
+    params.update(kwargs)
+    return params
+
+
+def install_litellm_cache(litellm) -> None:
+    """Route litellm.completion/acompletion through the LLM cache.
+
+    CrewAI agents call these module functions for every LLM request, so
+    patching them covers the flow tasks and all agents. Streaming requests
+    bypass the cache. Calling this more than once is harmless.
+    """
+    if getattr(litellm.completion, '_llm_cache_installed', False):
+        return
+
+    completion = litellm.completion
+    acompletion = litellm.acompletion
+
+    def lookup(params):
+        cache = get_llm_cache()
+        if cache is None or params.get('stream'):
+            return None, None, None
+        key = cache_key(params)
+        cached = cache.get(key)
+        return cache, key, (litellm.ModelResponse(**cached) if cached is not None else None)
+
+    def remember(cache, key, params, response):
+        try:
+            cache.set(key, params.get('model'), response.model_dump())
+        except Exception as e:
+            logger.warning(f"Could not cache LLM response: {e}")
+
+    @functools.wraps(completion)
+    def cached_completion(*args, **kwargs):
+        params = _request_params(args, kwargs)
+        cache, key, cached = lookup(params)
+        if cached is not None:
+            return cached
+        response = completion(*args, **kwargs)
+        if cache is not None:
+            remember(cache, key, params, response)
+        return response
+
+    @functools.wraps(acompletion)
+    async def cached_acompletion(*args, **kwargs):
+        params = _request_params(args, kwargs)
+        cache, key, cached = lookup(params)
+        if cached is not None:
+            return cached
+        response = await acompletion(*args, **kwargs)
+        if cache is not None:
+            remember(cache, key, params, response)
+        return response
+
+    cached_completion._llm_cache_installed = True
+    litellm.completion = cached_completion
+    litellm.acompletion = cached_acompletion
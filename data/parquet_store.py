@@ -0,0 +1,92 @@
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+# Columns stored in each partition file (transaction_date is the partition key)
+TRADE_SCHEMA = pa.schema([
+    ('company_name', _DICT),
+    ('ticker', _DICT),
+    ('insider_name', _DICT),
+    ('insider_title', _DICT),
+    ('transaction_type', _DICT),
+    ('shares', pa.float64()),
+    ('price', pa.float64()),
+    ('value', pa.float64()),
+    ('accession_number', pa.string()),
+    ('line_number', pa.int32()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([('transaction_date', pa.string())]), flavor='hive')
+
+
+class ParquetTradeStore:
+    """Columnar, date-partitioned copy of the insider trade history.
+
+    Each trade date lives in its own `transaction_date=YYYY-MM-DD`
+    directory, so range scans only open the partitions they need.
+    Repeated names are dictionary-encoded.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or settings.PARQUET_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _partition_dir(self, transaction_date: str) -> Path:
+        return self.root / f"transaction_date={transaction_date}"
+
+    def write_partition(self, transaction_date: str, rows: Sequence[Tuple]) -> int:
+        """Replace the partition for one trade date with rows ordered like TRADE_SCHEMA"""
+        partition = self._partition_dir(transaction_date)
+        if not rows:
+            shutil.rmtree(partition, ignore_errors=True)
+            return 0
+
+        table = pa.table(
+            [pa.array(values, type=field.type) for field, values in zip(TRADE_SCHEMA, zip(*rows))],
+            schema=TRADE_SCHEMA,
+        )
+        partition.mkdir(parents=True, exist_ok=True)
+        tmp_path = partition / ".part-0.parquet.tmp"
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, partition / "part-0.parquet")
+        return len(rows)
+
+    def read_trades(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        tickers: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load trades as a DataFrame, reading only the requested columns and date partitions"""
+        if not any(self.root.iterdir()):
+            return pd.DataFrame(columns=list(columns) if columns else TRADE_SCHEMA.names + ['transaction_date'])
+
+        dataset = ds.dataset(self.root, format='parquet', partitioning=PARTITIONING)
+        conditions: List[ds.Expression] = []
+        if start_date:
+            conditions.append(ds.field('transaction_date') >= start_date)
+        if end_date:
+            conditions.append(ds.field('transaction_date') <= end_date)
+        if tickers:
+            conditions.append(ds.field('ticker').isin([t.upper() for t in tickers]))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+        return table.to_pandas()
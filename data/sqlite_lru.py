@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SQLiteLRUCache:
+    """Size-bounded SQLite key/value table with least-recently-used eviction.
+
+    Subclasses name the table and its payload `columns`; every row also
+    records its size and its creation and last-access times. Entries older
+    than `ttl` seconds (when set) are treated as missing, and the least
+    recently used entries are evicted once the stored sizes exceed
+    `max_bytes`. Subclasses decide what counts as a hit or a miss.
+    """
+
+    table: str = ""
+    # (name, SQL type) of the payload columns stored next to the key
+    columns: Tuple[Tuple[str, str], ...] = ()
+
+    def __init__(self, db_path: Path, max_bytes: int, ttl: Optional[float] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_table()
+        self._total_bytes = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+
+    def _create_table(self) -> None:
+        expected = ['key', *(name for name, _ in self.columns), 'size', 'created_at', 'accessed_at']
+        existing = [row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")]
+        if existing and existing != expected:
+            # Cached data can always be fetched again, so an older layout is simply dropped
+            logger.info(f"Recreating {self.table} with the current schema")
+            self._conn.execute(f"DROP TABLE {self.table}")
+        payload = ''.join(f"{name} {sql_type},\n" for name, sql_type in self.columns)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                {payload}
+                size INTEGER,
+                created_at REAL,
+                accessed_at REAL
+            )
+        """)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)")
+        self._conn.commit()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get(self, key: str, columns: Sequence[str], touch: bool = True) -> Optional[Tuple]:
+        """Return the given payload columns for `key`, or None if it is missing or expired.
+
+        With `touch`, the entry is marked as used now for eviction purposes.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT size, created_at, {', '.join(columns)} FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl and now - row[1] > self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[0]
+                return None
+            if touch:
+                self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+        return row[2:]
+
+    def _put(self, key: str, values: Dict[str, Any], size: int) -> None:
+        """Store or replace the entry for `key`, then evict down to max_bytes"""
+        if size > self.max_bytes:
+            return
+        names = [name for name, _ in self.columns]
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(f"""
+                INSERT OR REPLACE INTO {self.table} (key, {', '.join(names)}, size, created_at, accessed_at)
+                VALUES ({', '.join('?' * (len(names) + 4))})
+            """, (key, *(values.get(name) for name in names), size, now, now))
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until the cache fits in max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        if self.ttl:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+            self._total_bytes = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()[0]
+        cursor = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at")
+        evicted = []
+        for key, size in cursor:
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} entries from {self.table}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for this run and current cache size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size_bytes': self._total_bytes,
+        }
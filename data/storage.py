@@ -1,24 +1,208 @@
+import hashlib
 import json
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple, Union
 from utils.logger import setup_logger
 from config.settings import settings
 
 logger = setup_logger(__name__)
 
+_parquet_export_lock = threading.Lock()
+
+SCHEMA_VERSION = 7
+
+# Transaction types counted on the buy and sell side of the rollups
+BUY_TYPE = 'Purchase'
+SELL_TYPE = 'Sale'
+
+ROLLUP_DIMENSIONS = {'ticker': 'ticker', 'insider': 'insider_name'}
+ROLLUP_METRICS = {'trade_count', 'shares', 'value', 'buy_count', 'buy_value', 'sell_count', 'sell_value'}
+
+ROLLUP_COLUMNS = """(period, period_start, dimension, key, company_name, trade_count, shares, value,
+     buy_count, buy_value, sell_count, sell_value)"""
+
+ROLLUP_SUMS = """MAX(company_name), SUM(trade_count), TOTAL(shares), TOTAL(value),
+           SUM(buy_count), TOTAL(buy_value), SUM(sell_count), TOTAL(sell_value)"""
+
+# Monday of the week containing a day bucket
+WEEK_START_SQL = "date(period_start, '-6 days', 'weekday 1')"
+
+# Full rebuild from the raw trades, used only when the rollup table is created
+ROLLUP_DAY_BACKFILL_SQL = f"""
+    INSERT INTO trade_rollups {ROLLUP_COLUMNS}
+    SELECT 'day', transaction_date, ?, {{key}}, MAX(company_name), COUNT(*), TOTAL(shares), TOTAL(value),
+           SUM(transaction_type = '{BUY_TYPE}'),
+           TOTAL(CASE WHEN transaction_type = '{BUY_TYPE}' THEN value END),
+           SUM(transaction_type = '{SELL_TYPE}'),
+           TOTAL(CASE WHEN transaction_type = '{SELL_TYPE}' THEN value END)
+    FROM insider_trades
+    -- The no-op modifier normalizes out-of-range days, so only real calendar dates match
+    WHERE date(transaction_date, '+0 days') = transaction_date AND {{key}} IS NOT NULL
+    GROUP BY transaction_date, {{key}}
+"""
+
+# Week buckets are always summed from day buckets, never from the raw trades
+ROLLUP_WEEK_BACKFILL_SQL = f"""
+    INSERT INTO trade_rollups {ROLLUP_COLUMNS}
+    SELECT 'week', {WEEK_START_SQL}, dimension, key, {ROLLUP_SUMS}
+    FROM trade_rollups
+    WHERE period = 'day'
+    GROUP BY dimension, 2, key
+"""
+
+# Signed per-day deltas staged during a bulk upsert, one row per (day, dimension, key) per chunk
+CREATE_ROLLUP_DELTAS_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS rollup_deltas (
+        period_start TEXT, dimension TEXT, key TEXT, company_name TEXT,
+        trade_count INTEGER, shares REAL, value REAL,
+        buy_count INTEGER, buy_value REAL, sell_count INTEGER, sell_value REAL
+    )
+"""
+
+# Adds the staged deltas onto the day buckets ({period_start} = "period_start") or the
+# week buckets ({period_start} = WEEK_START_SQL), in primary-key order
+APPLY_ROLLUP_DELTAS_SQL = f"""
+    INSERT INTO trade_rollups {ROLLUP_COLUMNS}
+    SELECT ?, {{period_start}}, dimension, key, {ROLLUP_SUMS}
+    FROM rollup_deltas
+    GROUP BY dimension, 2, key
+    ORDER BY dimension, 2, key
+    ON CONFLICT (period, dimension, period_start, key) DO UPDATE SET
+        company_name = COALESCE(excluded.company_name, trade_rollups.company_name),
+        trade_count = trade_rollups.trade_count + excluded.trade_count,
+        shares = trade_rollups.shares + excluded.shares,
+        value = trade_rollups.value + excluded.value,
+        buy_count = trade_rollups.buy_count + excluded.buy_count,
+        buy_value = trade_rollups.buy_value + excluded.buy_value,
+        sell_count = trade_rollups.sell_count + excluded.sell_count,
+        sell_value = trade_rollups.sell_value + excluded.sell_value
+"""
+
+# Buckets whose last trades were moved elsewhere by replacing upserts
+DELETE_EMPTY_ROLLUPS_SQL = f"""
+    DELETE FROM trade_rollups
+    WHERE trade_count <= 0 AND (period, period_start, dimension, key) IN (
+        SELECT 'day', period_start, dimension, key FROM rollup_deltas
+        UNION ALL
+        SELECT 'week', {WEEK_START_SQL}, dimension, key FROM rollup_deltas
+    )
+"""
+
+UPSERT_FILING_SQL = """
+    INSERT INTO sec_filings (cik, company_name, form_type, filing_date, accession_number)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (accession_number, cik) DO UPDATE SET
+        company_name = excluded.company_name,
+        form_type = excluded.form_type,
+        filing_date = excluded.filing_date
+    WHERE (sec_filings.company_name, sec_filings.form_type, sec_filings.filing_date)
+        IS NOT (excluded.company_name, excluded.form_type, excluded.filing_date)
+"""
+
+UPSERT_TRADE_SQL = """
+    INSERT INTO insider_trades 
+    (company_name, ticker, insider_name, insider_title, 
+     transaction_date, transaction_type, shares, price, value,
+     accession_number, line_number)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (accession_number, line_number) DO UPDATE SET
+        company_name = excluded.company_name,
+        ticker = excluded.ticker,
+        insider_name = excluded.insider_name,
+        insider_title = excluded.insider_title,
+        transaction_date = excluded.transaction_date,
+        transaction_type = excluded.transaction_type,
+        shares = excluded.shares,
+        price = excluded.price,
+        value = excluded.value
+    WHERE (insider_trades.company_name, insider_trades.ticker, insider_trades.insider_name,
+           insider_trades.insider_title, insider_trades.transaction_date, insider_trades.transaction_type,
+           insider_trades.shares, insider_trades.price, insider_trades.value)
+        IS NOT (excluded.company_name, excluded.ticker, excluded.insider_name,
+                excluded.insider_title, excluded.transaction_date, excluded.transaction_type,
+                excluded.shares, excluded.price, excluded.value)
+"""
+
+def _dict_factory(cursor: sqlite3.Cursor, row: Tuple) -> Dict[str, Any]:
+    return {description[0]: value for description, value in zip(cursor.description, row)}
+
+def _key_part(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)):
+        return f"{float(value):.6f}"
+    return str(value).strip()
+
+def natural_key(*values: Any) -> str:
+    """Stable surrogate accession number for rows that arrive without one"""
+    digest = hashlib.sha1('|'.join(_key_part(v) for v in values).encode('utf-8')).hexdigest()
+    return f"nk:{digest}"
+
+@lru_cache(maxsize=4096)
+def _is_trade_date(day: Any) -> bool:
+    """Whether a trade date is a real YYYY-MM-DD calendar date, and so has rollup buckets"""
+    if not isinstance(day, str) or len(day) != 10:
+        return False
+    try:
+        date.fromisoformat(day)
+    except ValueError:
+        return False
+    return True
+
+def _add_rollup_delta(deltas: Dict[Tuple, List], row: Tuple, sign: int):
+    """Add (sign=1) or remove (sign=-1) one trade row's contribution to its day buckets.
+    
+    Deltas are [company_name, trade_count, shares, value, buy_count,
+    buy_value, sell_count, sell_value], keyed by (day, dimension, key).
+    """
+    company, ticker, insider, _, transaction_date, transaction_type, shares, _, value = row
+    if not _is_trade_date(transaction_date):
+        return
+    shares = (shares or 0) * sign
+    value = (value or 0) * sign
+    for dimension, key in (('ticker', ticker), ('insider', insider)):
+        if key is None:
+            continue
+        delta = deltas.get((transaction_date, dimension, key))
+        if delta is None:
+            delta = deltas[(transaction_date, dimension, key)] = [None, 0, 0.0, 0.0, 0, 0.0, 0, 0.0]
+        if sign > 0 and company is not None:
+            delta[0] = company
+        delta[1] += sign
+        delta[2] += shares
+        delta[3] += value
+        if transaction_type == BUY_TYPE:
+            delta[4] += sign
+            delta[5] += value
+        elif transaction_type == SELL_TYPE:
+            delta[6] += sign
+            delta[7] += value
+
 class DataStorage:
     """Handle data storage and retrieval"""
     
-    def __init__(self):
-        self.db_path = settings.DATA_DIR / "insider_trading.db"
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or settings.DATA_DIR / "insider_trading.db"
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the configured journal, sync and cache pragmas"""
+        conn = sqlite3.connect(self.db_path, timeout=settings.SQLITE_BUSY_TIMEOUT)
+        conn.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        conn.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        return conn
+    
     def init_database(self):
         """Initialize SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # SEC Filings table
@@ -29,6 +213,7 @@ class DataStorage:
                         company_name TEXT,
                         form_type TEXT,
                         filing_date TEXT,
+                        accession_number TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
@@ -46,6 +231,8 @@ class DataStorage:
                         shares INTEGER,
                         price REAL,
                         value REAL,
+                        accession_number TEXT,
+                        line_number INTEGER,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
@@ -60,87 +247,639 @@ class DataStorage:
                     )
                 """)
                 
+                self._migrate(conn)
+                
                 conn.commit()
                 logger.info("Database initialized successfully")
                 
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
     
-    def save_sec_filings(self, filings: List[Dict[str, Any]]) -> bool:
-        """Save SEC filings to database"""
+    def _migrate(self, conn: sqlite3.Connection):
+        """Bring an existing database up to SCHEMA_VERSION"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 2:
+            self._migrate_natural_keys(conn)
+        if version < 3:
+            self._create_query_indexes(conn)
+        if version < 4:
+            self._create_rollups(conn)
+        if version < 5:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        if version < 6:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_shards (
+                    shard_id TEXT PRIMARY KEY,
+                    start_date TEXT,
+                    end_date TEXT,
+                    filings INTEGER,
+                    trades INTEGER,
+                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        if version < 7:
+            # Replaced by an index in the queries' (transaction_date, id) order
+            conn.execute("DROP INDEX IF EXISTS ix_insider_trades_date")
+            self._create_query_indexes(conn)
+        
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _migrate_natural_keys(self, conn: sqlite3.Connection):
+        """v2: add accession-number natural keys, deduplicate rows and enforce uniqueness"""
+        conn.create_function("natural_key", -1, natural_key, deterministic=True)
+        
+        def columns(table: str) -> set:
+            return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        
+        if 'accession_number' not in columns('sec_filings'):
+            conn.execute("ALTER TABLE sec_filings ADD COLUMN accession_number TEXT")
+        trade_columns = columns('insider_trades')
+        if 'accession_number' not in trade_columns:
+            conn.execute("ALTER TABLE insider_trades ADD COLUMN accession_number TEXT")
+        if 'line_number' not in trade_columns:
+            conn.execute("ALTER TABLE insider_trades ADD COLUMN line_number INTEGER")
+        
+        # Rows written before v2 have no accession number; key them on their content
+        conn.execute("""
+            UPDATE sec_filings
+            SET accession_number = natural_key(cik, company_name, form_type, filing_date)
+            WHERE accession_number IS NULL
+        """)
+        conn.execute("""
+            UPDATE insider_trades
+            SET accession_number = natural_key(company_name, ticker, insider_name, transaction_date,
+                                               transaction_type, shares, price, value),
+                line_number = 0
+            WHERE accession_number IS NULL
+        """)
+        
+        # Keep the most recently written copy of each duplicated row
+        filings_removed = conn.execute("""
+            DELETE FROM sec_filings WHERE id NOT IN (
+                SELECT MAX(id) FROM sec_filings GROUP BY accession_number, cik
+            )
+        """).rowcount
+        trades_removed = conn.execute("""
+            DELETE FROM insider_trades WHERE id NOT IN (
+                SELECT MAX(id) FROM insider_trades GROUP BY accession_number, line_number
+            )
+        """).rowcount
+        
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_sec_filings_accession
+            ON sec_filings (accession_number, cik)
+        """)
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_insider_trades_accession_line
+            ON insider_trades (accession_number, line_number)
+        """)
+        
+        if filings_removed or trades_removed:
+            logger.info(f"Removed {filings_removed} duplicate filings and {trades_removed} duplicate trades")
+    
+    def _create_query_indexes(self, conn: sqlite3.Connection):
+        """v3/v7: indexes for time-range queries on trade date, ticker and insider.
+        
+        Trade queries return whole rows, so these indexes narrow the search
+        and supply the ORDER BY transaction_date DESC, id DESC order (the
+        ticker and insider indexes end in the rowid implicitly); they do not
+        cover the selected columns.
+        """
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_insider_trades_date_id
+            ON insider_trades (transaction_date DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_insider_trades_ticker_date
+            ON insider_trades (ticker, transaction_date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_insider_trades_insider_date
+            ON insider_trades (insider_name, transaction_date)
+        """)
+    
+    def _create_rollups(self, conn: sqlite3.Connection):
+        """v4: daily and weekly per-ticker / per-insider rollups, backfilled from existing trades"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trade_rollups (
+                period TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                company_name TEXT,
+                trade_count INTEGER,
+                shares REAL,
+                value REAL,
+                buy_count INTEGER,
+                buy_value REAL,
+                sell_count INTEGER,
+                sell_value REAL,
+                PRIMARY KEY (period, dimension, period_start, key)
+            ) WITHOUT ROWID
+        """)
+        for dimension, column in ROLLUP_DIMENSIONS.items():
+            conn.execute(ROLLUP_DAY_BACKFILL_SQL.format(key=column), (dimension,))
+        conn.execute(ROLLUP_WEEK_BACKFILL_SQL)
+    
+    @staticmethod
+    def _existing_trades(cursor: sqlite3.Cursor, chunk: List[Tuple]) -> Dict[Tuple, Tuple]:
+        """Stored content of the trades in a chunk that are already in the table, keyed by (accession, line)"""
+        accessions = list({row[9] for row in chunk})
+        existing = {}
+        for i in range(0, len(accessions), 500):
+            batch = accessions[i:i + 500]
+            for row in cursor.execute(f"""
+                SELECT company_name, ticker, insider_name, insider_title, transaction_date,
+                       transaction_type, shares, price, value, accession_number, line_number
+                FROM insider_trades
+                WHERE accession_number IN ({', '.join('?' * len(batch))})
+            """, batch):
+                existing[row[9], row[10]] = row[:9]
+        return existing
+    
+    @staticmethod
+    def _apply_rollup_deltas(conn: sqlite3.Connection, replaced: bool):
+        """Add the staged day deltas onto the day buckets and, summed per week, onto the week buckets"""
+        conn.execute(APPLY_ROLLUP_DELTAS_SQL.format(period_start="period_start"), ('day',))
+        conn.execute(APPLY_ROLLUP_DELTAS_SQL.format(period_start=WEEK_START_SQL), ('week',))
+        if replaced:
+            conn.execute(DELETE_EMPTY_ROLLUPS_SQL)
+        conn.execute("DROP TABLE rollup_deltas")
+    
+    @staticmethod
+    def _filing_row(filing: Dict[str, Any]) -> Tuple:
+        cik = filing.get('cik')
+        row = (
+            str(cik) if cik is not None else None,
+            filing.get('company'),
+            filing.get('form'),
+            filing.get('filing_date')
+        )
+        return row + (filing.get('accession_number') or natural_key(*row),)
+    
+    @staticmethod
+    def _trade_row(trade: Dict[str, Any]) -> Tuple:
+        row = (
+            trade.get('company'),
+            trade.get('ticker'),
+            trade.get('insider_name'),
+            trade.get('title'),
+            trade.get('transaction_date'),
+            trade.get('transaction_type'),
+            trade.get('shares'),
+            trade.get('price'),
+            trade.get('value')
+        )
+        if trade.get('accession_number'):
+            return row + (trade['accession_number'], trade.get('line_number') or 0)
+        key = natural_key(row[0], row[1], row[2], row[4], row[5], row[6], row[7], row[8])
+        return row + (key, 0)
+    
+    def _bulk_execute(
+        self,
+        sql: str,
+        rows: Iterator[Tuple],
+        chunk_size: Optional[int] = None,
+        prepare_chunk: Optional[Callable[[sqlite3.Cursor, List[Tuple]], List[Tuple]]] = None,
+        finalize: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> int:
+        """Run one prepared statement over chunks of rows inside a single transaction.
+        
+        `prepare_chunk` is called inside the transaction with each chunk
+        before it is written and returns the rows that still need writing;
+        `finalize` runs inside the same transaction once all chunks are
+        written. The transaction takes the write lock up front, so nothing
+        read in between can change before the chunk is written.
+        """
+        chunk_size = chunk_size or settings.STORAGE_BATCH_SIZE
+        total = 0
+        conn = self._connect()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
                 cursor = conn.cursor()
-                
-                for filing in filings:
-                    cursor.execute("""
-                        INSERT INTO sec_filings (cik, company_name, form_type, filing_date)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        filing.get('cik'),
-                        filing.get('company'),
-                        filing.get('form'),
-                        filing.get('filing_date')
-                    ))
-                
-                conn.commit()
-                logger.info(f"Saved {len(filings)} SEC filings")
-                return True
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    if prepare_chunk is not None:
+                        chunk = prepare_chunk(cursor, chunk)
+                    if chunk:
+                        cursor.executemany(sql, chunk)
+                if finalize is not None:
+                    finalize(conn)
+        finally:
+            conn.close()
+        return total
+    
+    def bulk_upsert_sec_filings(self, filings: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """Upsert SEC filings keyed by (accession number, CIK) from any iterable; returns rows processed"""
+        return self._bulk_execute(UPSERT_FILING_SQL, map(self._filing_row, filings), chunk_size)
+    
+    def bulk_upsert_trades(self, trades: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """Upsert insider trades keyed by (accession number, line number) from any iterable; returns rows processed.
+        
+        Rollups are maintained from deltas rather than recomputed: each new
+        or changed row adds its contribution to its day bucket and a replaced
+        row's stored contribution is subtracted. Each chunk's deltas are
+        summed in Python and staged in a temporary table; at the end they are
+        added onto the day buckets, and summed per week onto the week
+        buckets, in one ordered pass. Rows identical to what is stored are
+        not written.
+        """
+        changed_dates = set()
+        replaced = False
+        
+        def stage_chunk(cursor: sqlite3.Cursor, chunk: List[Tuple]) -> List[Tuple]:
+            nonlocal replaced
+            current = self._existing_trades(cursor, chunk)
+            changed, deltas = [], {}
+            for row in chunk:
+                key, new = row[9:], row[:9]
+                old = current.get(key)
+                if old == new:
+                    continue
+                if old is not None:
+                    _add_rollup_delta(deltas, old, -1)
+                    changed_dates.add(old[4])
+                    replaced = True
+                _add_rollup_delta(deltas, new, 1)
+                changed_dates.add(new[4])
+                current[key] = new
+                changed.append(row)
+            
+            cursor.execute(CREATE_ROLLUP_DELTAS_SQL)
+            cursor.executemany(
+                "INSERT INTO rollup_deltas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [bucket + tuple(delta) for bucket, delta in deltas.items() if any(delta[1:])]
+            )
+            return changed
+        
+        def apply_rollups(conn: sqlite3.Connection):
+            if changed_dates:
+                self._apply_rollup_deltas(conn, replaced)
+        
+        count = self._bulk_execute(
+            UPSERT_TRADE_SQL, map(self._trade_row, trades), chunk_size, stage_chunk, apply_rollups
+        )
+        if settings.PARQUET_ENABLED and changed_dates:
+            self.export_parquet(changed_dates)
+        return count
+    
+    def export_parquet(self, dates: Optional[Iterable[str]] = None) -> int:
+        """Mirror trades for the given trade dates (default: all) into the Parquet history store"""
+        try:
+            from data.parquet_store import TRADE_SCHEMA, ParquetTradeStore
+        except ImportError as e:
+            logger.warning(f"Parquet export skipped, pyarrow is not available: {e}")
+            return 0
+        
+        wanted = None if dates is None else {d for d in dates if d}
+        if wanted is not None and not wanted:
+            return 0
+        where, params = "WHERE transaction_date IS NOT NULL", []
+        if wanted is not None:
+            where += " AND transaction_date BETWEEN ? AND ?"
+            params = [min(wanted), max(wanted)]
+        
+        store = ParquetTradeStore()
+        exported = 0
+        conn = self._connect()
+        # Serialize exports so concurrent writers cannot replace a partition with an older read
+        _parquet_export_lock.acquire()
+        try:
+            cursor = conn.execute(f"""
+                SELECT transaction_date, {', '.join(TRADE_SCHEMA.names)}
+                FROM insider_trades
+                {where}
+                ORDER BY transaction_date
+            """, params)
+            # One partition at a time: rows arrive grouped by trade date
+            for transaction_date, group in groupby(cursor, key=itemgetter(0)):
+                if wanted is None or transaction_date in wanted:
+                    exported += store.write_partition(transaction_date, [row[1:] for row in group])
+        finally:
+            _parquet_export_lock.release()
+            conn.close()
+        return exported
+    
+    def load_trades_frame(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        tickers: Optional[Sequence[str]] = None,
+    ):
+        """Read trade history from the Parquet store as a pandas DataFrame"""
+        from data.parquet_store import ParquetTradeStore
+        return ParquetTradeStore().read_trades(columns, start_date, end_date, tickers)
+    
+    def save_sec_filings(self, filings: Iterable[Dict[str, Any]]) -> bool:
+        """Save SEC filings to database"""
+        try:
+            count = self.bulk_upsert_sec_filings(filings)
+            logger.info(f"Saved {count} SEC filings")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving SEC filings: {e}")
             return False
     
-    def save_insider_trades(self, trades: List[Dict[str, Any]]) -> bool:
+    def save_insider_trades(self, trades: Iterable[Dict[str, Any]]) -> bool:
         """Save insider trades to database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for trade in trades:
-                    cursor.execute("""
-                        INSERT INTO insider_trades 
-                        (company_name, ticker, insider_name, insider_title, 
-                         transaction_date, transaction_type, shares, price, value)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        trade.get('company'),
-                        trade.get('ticker'),
-                        trade.get('insider_name'),
-                        trade.get('title'),
-                        trade.get('transaction_date'),
-                        trade.get('transaction_type'),
-                        trade.get('shares'),
-                        trade.get('price'),
-                        trade.get('value')
-                    ))
-                
-                conn.commit()
-                logger.info(f"Saved {len(trades)} insider trades")
-                return True
+            count = self.bulk_upsert_trades(trades)
+            logger.info(f"Saved {count} insider trades")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving insider trades: {e}")
             return False
     
+    @staticmethod
+    def _trade_filters(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        ticker: Union[str, Sequence[str], None] = None,
+        insider: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Build a parameterized WHERE clause for insider trade queries"""
+        clauses, params = [], []
+        if start_date:
+            clauses.append("transaction_date >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("transaction_date <= ?")
+            params.append(end_date)
+        if ticker:
+            tickers = [ticker] if isinstance(ticker, str) else list(ticker)
+            clauses.append(f"ticker IN ({', '.join('?' * len(tickers))})")
+            params.extend(t.upper() for t in tickers)
+        if insider:
+            clauses.append("insider_name = ?")
+            params.append(insider)
+        if transaction_type:
+            clauses.append("transaction_type = ?")
+            params.append(transaction_type)
+        if min_value is not None:
+            clauses.append("value >= ?")
+            params.append(min_value)
+        if max_value is not None:
+            clauses.append("value <= ?")
+            params.append(max_value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def iter_trades(self, batch_size: Optional[int] = None, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Stream insider trades matching the filters, newest trade date first.
+        
+        Accepts the same filters as query_trades. Rows are fetched from the
+        cursor in batches, so arbitrarily long histories can be scanned
+        without loading them into memory.
+        """
+        where, params = self._trade_filters(**filters)
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            cursor = conn.execute(f"""
+                SELECT * FROM insider_trades
+                {where}
+                ORDER BY transaction_date DESC, id DESC
+            """, params)
+            while True:
+                rows = cursor.fetchmany(batch_size or settings.STORAGE_BATCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
+    def query_trades(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        ticker: Union[str, Sequence[str], None] = None,
+        insider: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Return one page of insider trades filtered by trade date, ticker, insider, type and value"""
+        where, params = self._trade_filters(
+            start_date, end_date, ticker, insider, transaction_type, min_value, max_value
+        )
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            return conn.execute(f"""
+                SELECT * FROM insider_trades
+                {where}
+                ORDER BY transaction_date DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, params + [limit if limit is not None else -1, offset]).fetchall()
+        finally:
+            conn.close()
+    
     def get_historical_trades(self, days_back: int = 7) -> List[Dict[str, Any]]:
-        """Retrieve historical insider trades"""
+        """Retrieve insider trades whose transaction date falls in the last `days_back` days"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT * FROM insider_trades 
-                    WHERE created_at >= datetime('now', '-{} days')
-                    ORDER BY created_at DESC
-                """.format(days_back))
-                
-                columns = [description[0] for description in cursor.description]
-                trades = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                
-                logger.info(f"Retrieved {len(trades)} historical trades")
-                return trades
+            start_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+            trades = self.query_trades(start_date=start_date)
+            
+            logger.info(f"Retrieved {len(trades)} historical trades")
+            return trades
                 
         except Exception as e:
             logger.error(f"Error retrieving historical trades: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def get_rollups(
+        self,
+        period: str = 'day',
+        dimension: str = 'ticker',
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        keys: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return pre-aggregated day or week rollup rows for tickers or insiders"""
+        clauses, params = ["period = ?", "dimension = ?"], [period, dimension]
+        if start_date:
+            clauses.append("period_start >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("period_start <= ?")
+            params.append(end_date)
+        if keys:
+            clauses.append(f"key IN ({', '.join('?' * len(keys))})")
+            params.extend(keys)
+        
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            return conn.execute(f"""
+                SELECT * FROM trade_rollups
+                WHERE {' AND '.join(clauses)}
+                ORDER BY period_start, key
+            """, params).fetchall()
+        finally:
+            conn.close()
+    
+    def get_top_activity(
+        self,
+        start_date: str,
+        end_date: str,
+        dimension: str = 'ticker',
+        metric: str = 'value',
+        limit: Optional[int] = 10,
+    ) -> List[Dict[str, Any]]:
+        """Rank tickers or insiders by a rollup metric summed over a date range"""
+        if metric not in ROLLUP_METRICS:
+            raise ValueError(f"Unknown rollup metric: {metric}")
+        
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            return conn.execute(f"""
+                SELECT key, MAX(company_name) AS company_name,
+                       SUM(trade_count) AS trade_count, TOTAL(shares) AS shares, TOTAL(value) AS value,
+                       SUM(buy_count) AS buy_count, TOTAL(buy_value) AS buy_value,
+                       SUM(sell_count) AS sell_count, TOTAL(sell_value) AS sell_value
+                FROM trade_rollups
+                WHERE period = 'day' AND dimension = ? AND period_start BETWEEN ? AND ?
+                GROUP BY key
+                ORDER BY {metric} DESC
+                LIMIT ?
+            """, (dimension, start_date, end_date, limit if limit is not None else -1)).fetchall()
+        finally:
+            conn.close()
+    
+    def get_daily_buy_sell(
+        self,
+        start_date: str,
+        end_date: str,
+        dimension: str = 'ticker',
+        active_on: Optional[str] = None,
+    ) -> List[Tuple[int, str, float, float]]:
+        """Return (days since start_date, key, buy_value, sell_value) for the daily rollups in a range.
+        
+        Rows are plain tuples with the day already numbered, so callers can
+        load the series into arrays cheaply. With `active_on`, only keys that
+        have a rollup on that day are returned.
+        """
+        active_clause = ""
+        params: List[Any] = [start_date, dimension, start_date, end_date]
+        if active_on:
+            active_clause = """AND key IN (
+                    SELECT key FROM trade_rollups WHERE period = 'day' AND dimension = ? AND period_start = ?
+                )"""
+            params.extend([dimension, active_on])
+        
+        conn = self._connect()
+        try:
+            return conn.execute(f"""
+                SELECT CAST(julianday(period_start) - julianday(?) AS INTEGER), key, buy_value, sell_value
+                FROM trade_rollups
+                WHERE period = 'day' AND dimension = ? AND period_start BETWEEN ? AND ?
+                {active_clause}
+            """, params).fetchall()
+        finally:
+            conn.close()
+    
+    def get_baseline_comparison(
+        self,
+        as_of: Optional[str] = None,
+        baseline_days: int = 90,
+        dimension: str = 'ticker',
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Compare each key's activity on `as_of` with its trailing daily average.
+        
+        Reads only the daily rollups, so the cost depends on the number of
+        tickers (or insiders) in the window rather than the number of trades.
+        """
+        as_of = as_of or datetime.now().strftime('%Y-%m-%d')
+        start = (date.fromisoformat(as_of) - timedelta(days=baseline_days)).isoformat()
+        
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            rows = conn.execute("""
+                SELECT key, MAX(company_name) AS company_name,
+                       TOTAL(CASE WHEN period_start = :as_of THEN value END) AS today_value,
+                       TOTAL(CASE WHEN period_start = :as_of THEN buy_value END) AS today_buy_value,
+                       TOTAL(CASE WHEN period_start = :as_of THEN sell_value END) AS today_sell_value,
+                       TOTAL(CASE WHEN period_start < :as_of THEN value END) / :days AS baseline_value,
+                       TOTAL(CASE WHEN period_start < :as_of THEN buy_value END) / :days AS baseline_buy_value,
+                       TOTAL(CASE WHEN period_start < :as_of THEN sell_value END) / :days AS baseline_sell_value
+                FROM trade_rollups
+                WHERE period = 'day' AND dimension = :dimension AND period_start BETWEEN :start AND :as_of
+                GROUP BY key
+                HAVING today_value > 0
+                ORDER BY today_value DESC
+                LIMIT :limit
+            """, {
+                'as_of': as_of, 'start': start, 'days': baseline_days,
+                'dimension': dimension, 'limit': limit if limit is not None else -1,
+            }).fetchall()
+        finally:
+            conn.close()
+        
+        for row in rows:
+            baseline = row['baseline_value']
+            row['ratio_to_baseline'] = row['today_value'] / baseline if baseline else None
+        return rows
+    
+    def get_ingest_state(self, key: str) -> Optional[Any]:
+        """Return a persisted ingestion marker (e.g. the daemon's high-water mark)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+    
+    def set_ingest_state(self, key: str, value: Any):
+        """Persist an ingestion marker as JSON"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT INTO ingest_state (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+                """, (key, json.dumps(value)))
+        finally:
+            conn.close()
+    
+    def get_completed_shards(self) -> Dict[str, Dict[str, Any]]:
+        """Return backfill shards already recorded as complete, keyed by shard id"""
+        conn = self._connect()
+        conn.row_factory = _dict_factory
+        try:
+            return {row['shard_id']: row for row in conn.execute("SELECT * FROM backfill_shards")}
+        finally:
+            conn.close()
+    
+    def mark_shard_complete(self, shard_id: str, start_date: str, end_date: str, filings: int, trades: int):
+        """Record that a backfill shard has been fully written"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO backfill_shards (shard_id, start_date, end_date, filings, trades, completed_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (shard_id, start_date, end_date, filings, trades))
+        finally:
+            conn.close()
\ No newline at end of file
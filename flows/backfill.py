@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set, Tuple
+from data.storage import DataStorage
+from tools.edgar_index import iter_index_filings, plan_backfill_shards
+from tools.form4_parser import FORM4_TYPES
+from tools.form4_pipeline import fetch_and_parse
+from tools.sec_fetcher import EdgarFetcher, get_fetcher
+from utils.executors import make_executor
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+
+def shard_id(granularity: str, start: date, end: date) -> str:
+    return f"{granularity}:{start.isoformat()}:{end.isoformat()}"
+
+
+class HistoricalBackfill:
+    """Fill insider_trades with history by processing date-range shards in parallel.
+
+    Each shard reads its EDGAR index, then fetches and parses the Form 4
+    filings it lists and writes them through the bulk upsert path in
+    batches. Shards run on a thread pool but share one fetcher (and so one
+    SEC rate limit) and one parser process pool. Completed shards are
+    recorded in storage, so an interrupted backfill resumes where it
+    stopped.
+    """
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        granularity: Optional[str] = None,
+        workers: Optional[int] = None,
+        storage: Optional[DataStorage] = None,
+        fetcher: Optional[EdgarFetcher] = None,
+    ):
+        self.granularity = granularity or settings.BACKFILL_SHARD
+        self.workers = workers or settings.BACKFILL_WORKERS
+        self.storage = storage or DataStorage()
+        self.fetcher = fetcher or get_fetcher()
+        self.shards = plan_backfill_shards(start_date, end_date, self.granularity)
+
+        self._lock = threading.Lock()
+        self._trades_written = 0
+        self._shards_done = 0
+        self._pending = 0
+        self._started = 0.0
+
+    def process_shard(self, start: date, end: date, executor) -> Tuple[int, int, int]:
+        """Ingest one shard; returns (filings, trades) written and the number of filings that failed"""
+        filings_seen = trades_seen = 0
+        failed: Set[str] = set()
+        filings = iter_index_filings(start, end, forms=FORM4_TYPES, fetcher=self.fetcher, strict=True)
+        while True:
+            batch = list(islice(filings, settings.BACKFILL_BATCH_FILINGS))
+            if not batch:
+                break
+            # Fetch before writing so the write transaction is not held open during downloads
+            parsed = list(fetch_and_parse(batch, fetcher=self.fetcher, executor=executor, failed=failed))
+            self.storage.bulk_upsert_sec_filings([filing for filing in batch if filing['accession_number'] not in failed])
+            trades = self.storage.bulk_upsert_trades(parsed)
+            filings_seen += len(batch)
+            trades_seen += trades
+            with self._lock:
+                self._trades_written += trades
+        return filings_seen, trades_seen, len(failed)
+
+    def _report(self, label: str, filings: int, trades: int):
+        with self._lock:
+            self._shards_done += 1
+            elapsed = time.perf_counter() - self._started
+            done, total, written = self._shards_done, self._pending, self._trades_written
+        logger.info(
+            f"[{done}/{total}] {label}: {filings} filings, {trades} trades "
+            f"(total {written:,} trades, {written / elapsed:,.0f} rows/s, {elapsed:,.0f}s elapsed)"
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """Process every shard not yet recorded as complete"""
+        completed = self.storage.get_completed_shards()
+        today = date.today()
+        pending = [
+            (start, end) for start, end in self.shards
+            if shard_id(self.granularity, start, end) not in completed
+        ]
+        self._pending = len(pending)
+        logger.info(
+            f"Backfill: {len(self.shards)} {self.granularity} shards, "
+            f"{len(self.shards) - len(pending)} already complete, {len(pending)} to run on {self.workers} workers"
+        )
+
+        self._started = time.perf_counter()
+        failed: List[str] = []
+        with make_executor(settings.FORM4_PARSE_WORKERS) as parse_executor, \
+                ThreadPoolExecutor(max_workers=self.workers) as shard_pool:
+            futures = {
+                shard_pool.submit(self.process_shard, start, end, parse_executor): (start, end)
+                for start, end in pending
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                label = shard_id(self.granularity, start, end)
+                try:
+                    filings, trades, failures = future.result()
+                except Exception as e:
+                    logger.error(f"Backfill shard {label} failed: {e}")
+                    failed.append(label)
+                    continue
+                if failures:
+                    # Leave the shard unrecorded so re-running the backfill retries it
+                    logger.warning(f"Backfill shard {label}: {failures} filings could not be fetched or parsed")
+                    failed.append(label)
+                    self._report(label, filings, trades)
+                    continue
+                # Indexes for today (or later) may still grow, so keep those shards re-runnable
+                if end < today:
+                    self.storage.mark_shard_complete(label, start.isoformat(), end.isoformat(), filings, trades)
+                self._report(label, filings, trades)
+
+        elapsed = time.perf_counter() - self._started
+        summary = {
+            'shards': len(self.shards),
+            'processed': len(pending) - len(failed),
+            'failed': failed,
+            'trades': self._trades_written,
+            'seconds': elapsed,
+            'rows_per_second': self._trades_written / elapsed if elapsed else 0.0,
+        }
+        logger.info(
+            f"Backfill finished: {summary['processed']} shards, {summary['trades']:,} trades "
+            f"in {elapsed:,.0f}s ({summary['rows_per_second']:,.0f} rows/s), {len(failed)} failed"
+        )
+        return summary
@@ -0,0 +1,172 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from data.storage import DataStorage
+from tools.edgar_feed import iter_new_filings
+from tools.form4_parser import FORM4_TYPES
+from tools.form4_pipeline import fetch_and_parse
+from tools.sec_fetcher import EdgarFetcher, get_fetcher
+from utils.executors import make_executor
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+HIGH_WATER_MARK_KEY = "daemon.high_water_mark"
+
+
+def new_activity(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Value of the given trades per (transaction date, ticker), skipping trades without a valid date"""
+    totals: Dict[Tuple[str, str], float] = {}
+    for trade in trades:
+        ticker, transaction_date = trade.get('ticker'), trade.get('transaction_date')
+        if not ticker or not transaction_date:
+            continue
+        try:
+            date.fromisoformat(transaction_date)
+        except ValueError:
+            continue
+        totals[transaction_date, ticker] = totals.get((transaction_date, ticker), 0.0) + (trade.get('value') or 0)
+    return [
+        {'transaction_date': transaction_date, 'ticker': ticker, 'value': value}
+        for (transaction_date, ticker), value in sorted(totals.items())
+    ]
+
+
+class InsiderTradingDaemon:
+    """Long-running ingester that picks up Form 4 filings as EDGAR publishes them.
+
+    Each poll reads EDGAR's latest-filings feed back to the persisted
+    high-water mark (the newest acceptance time seen, plus the accessions
+    accepted at that instant), so only new filings are fetched and parsed.
+    The HTTP connection pool, parser processes and storage stay warm
+    between polls, and new trades update the rollups as soon as they are
+    written.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        storage: Optional[DataStorage] = None,
+        fetcher: Optional[EdgarFetcher] = None,
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.interval = interval or settings.DAEMON_POLL_INTERVAL
+        self.storage = storage or DataStorage()
+        self.fetcher = fetcher or get_fetcher()
+        self.executor = make_executor(settings.FORM4_PARSE_WORKERS)
+        self.on_update = on_update or self.log_update
+        self._stop = threading.Event()
+
+    def _load_mark(self) -> Tuple[datetime, Set[str], Dict[str, Dict[str, Any]]]:
+        mark = self.storage.get_ingest_state(HIGH_WATER_MARK_KEY)
+        if mark is None:
+            lookback = timedelta(hours=settings.DAEMON_INITIAL_LOOKBACK_HOURS)
+            return datetime.now(timezone.utc) - lookback, set(), {}
+        return datetime.fromisoformat(mark['accepted']), set(mark['accessions']), mark.get('retry', {})
+
+    def poll_once(self) -> Dict[str, Any]:
+        """Ingest filings accepted since the high-water mark and advance it.
+
+        Filings that could not be fetched or parsed are kept in the ingest
+        state and tried again on the next polls, up to
+        DAEMON_MAX_FILING_RETRIES times, since the mark moves past them.
+        """
+        started = time.perf_counter()
+        since, seen, retry = self._load_mark()
+        new_filings = list(iter_new_filings(FORM4_TYPES, since, seen, self.fetcher))
+        fresh = {filing['accession_number'] for filing in new_filings}
+        filings = new_filings + [entry['filing'] for accession, entry in retry.items() if accession not in fresh]
+        if not filings:
+            logger.debug(f"No new filings since {since.isoformat()}")
+            return {'filings': 0, 'trades': 0, 'tickers': [], 'seconds': time.perf_counter() - started}
+
+        failed: Set[str] = set()
+        trades = list(fetch_and_parse(filings, fetcher=self.fetcher, executor=self.executor, failed=failed))
+        self.storage.bulk_upsert_sec_filings([filing for filing in filings if filing['accession_number'] not in failed])
+        self.storage.bulk_upsert_trades(trades)
+
+        pending = {}
+        for filing in filings:
+            accession = filing['accession_number']
+            if accession not in failed:
+                continue
+            attempts = retry.get(accession, {}).get('attempts', 0) + 1
+            if attempts > settings.DAEMON_MAX_FILING_RETRIES:
+                logger.warning(f"Giving up on filing {accession} after {attempts} attempts")
+                continue
+            pending[accession] = {'filing': filing, 'attempts': attempts}
+
+        if new_filings:
+            accepted = {filing['accession_number']: datetime.fromisoformat(filing['accepted']) for filing in new_filings}
+            newest = max(accepted.values())
+            at_newest = {accession for accession, when in accepted.items() if when == newest}
+            if newest == since:
+                at_newest |= seen
+        else:
+            newest, at_newest = since, seen
+        self.storage.set_ingest_state(
+            HIGH_WATER_MARK_KEY,
+            {'accepted': newest.isoformat(), 'accessions': sorted(at_newest), 'retry': pending},
+        )
+
+        update = {
+            'filings': len(filings),
+            'failed': len(failed),
+            'trades': len(trades),
+            'tickers': sorted({trade['ticker'] for trade in trades if trade.get('ticker')}),
+            'activity': new_activity(trades),
+            'high_water_mark': newest.isoformat(),
+            'seconds': time.perf_counter() - started,
+        }
+        self.on_update(update)
+        return update
+
+    def log_update(self, update: Dict[str, Any]):
+        """Default update handler: log new activity against the trailing baseline"""
+        logger.info(
+            f"Ingested {update['trades']} trades from {update['filings']} filings "
+            f"in {update['seconds']:.2f}s (high-water mark {update['high_water_mark']})"
+        )
+        if update['failed']:
+            logger.warning(f"{update['failed']} filings failed and will be retried on the next poll")
+        # Form 4s arrive days after the trade, so each ticker is compared on its own trade date
+        by_date: Dict[str, Dict[str, float]] = {}
+        for row in update['activity']:
+            by_date.setdefault(row['transaction_date'], {})[row['ticker']] = row['value']
+        for as_of, new_values in sorted(by_date.items()):
+            baseline = {
+                row['key']: row
+                for row in self.storage.get_baseline_comparison(as_of, baseline_days=settings.ROLLUP_BASELINE_DAYS)
+            }
+            for ticker, value in sorted(new_values.items()):
+                row = baseline.get(ticker)
+                if row is None:
+                    logger.info(f"  {ticker} on {as_of}: ${value:,.0f} new")
+                    continue
+                ratio = f"{row['ratio_to_baseline']:.1f}x baseline" if row['ratio_to_baseline'] else "no baseline"
+                logger.info(
+                    f"  {ticker} ({row['company_name']}) on {as_of}: ${value:,.0f} new, "
+                    f"${row['today_value']:,.0f} that day, {ratio}"
+                )
+
+    def run_forever(self):
+        """Poll until stop() is called, keeping resources open between polls"""
+        logger.info(f"Daemon started, polling every {self.interval:.0f}s")
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Error polling for new filings: {e}")
+                self._stop.wait(self.interval)
+        finally:
+            self.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        logger.info("Daemon stopped")
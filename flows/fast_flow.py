@@ -0,0 +1,201 @@
+import asyncio
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+from data.storage import DataStorage
+from data.checkpoints import get_checkpoint_store, input_hash, new_run_id
+from flows.state import FastFlowState
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+from utils.step_timer import StepTimer
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+# The tools pull in crewai_tools and the plotting stack, so load them when a step needs them
+sec_tools = lazy_import("tools.sec_tools")
+chart_tools = lazy_import("tools.chart_tools")
+report_tools = lazy_import("tools.report_tools")
+
+# Step name -> steps it waits for. Filings and trades are fetched concurrently,
+# charts only need the stored trades, and the report joins every branch.
+STEP_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "fetch_sec_data": (),
+    "fetch_insider_trades": (),
+    "store_filings": ("fetch_sec_data",),
+    "store_trades": ("fetch_insider_trades",),
+    "create_charts": ("store_trades",),
+    "write_narrative": ("fetch_sec_data", "fetch_insider_trades"),
+    "generate_report": ("store_filings", "create_charts", "write_narrative"),
+}
+
+# State fields each step produces; these are what its checkpoint stores
+STEP_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    "fetch_sec_data": ("sec_filings",),
+    "fetch_insider_trades": ("insider_trades",),
+    "store_filings": (),
+    "store_trades": (),
+    "create_charts": ("chart_paths",),
+    "write_narrative": ("narrative",),
+    "generate_report": ("report_path",),
+}
+
+
+class FastInsiderTradingFlow:
+    """Deterministic insider trading pipeline that calls the tools directly.
+
+    Fetch, parse, store, chart and report run as plain function calls on
+    Python data, so a routine run makes no LLM requests. An LLM agent is
+    only used for the optional narrative step, and it is given a compact
+    summary rather than the raw trades. Steps run as a DAG (see
+    STEP_DEPENDENCIES), each in a worker thread, so independent branches
+    overlap. Every finished step is checkpointed under the run ID, so
+    resuming a failed run skips the steps that already completed.
+    """
+
+    def __init__(self, hours_back: int = 24, narrative: Optional[bool] = None, run_id: Optional[str] = None):
+        self.checkpoints = get_checkpoint_store()
+        self.state = FastFlowState(
+            run_id=run_id or new_run_id(),
+            hours_back=hours_back,
+            narrative_enabled=settings.FLOW_NARRATIVE if narrative is None else narrative,
+        )
+        run = self.checkpoints.get_run(self.state.run_id)
+        if run is not None:
+            # A resumed run keeps the parameters it was started with
+            self.state = FastFlowState(run_id=self.state.run_id, **run['params'])
+            logger.info(f"Resuming run {self.state.run_id}")
+        else:
+            self.checkpoints.start_run(self.state.run_id, type(self).__name__, self.state.model_dump(
+                include={'hours_back', 'narrative_enabled'}
+            ))
+        self.storage = DataStorage()
+        self.timer = StepTimer()
+
+    def kickoff(self) -> Dict[str, Any]:
+        """Run the flow to completion from synchronous code"""
+        return asyncio.run(self.kickoff_async())
+
+    async def kickoff_async(self) -> Dict[str, Any]:
+        """Run every step as soon as the steps it depends on have finished"""
+        dependencies = dict(STEP_DEPENDENCIES)
+        if not self.state.narrative_enabled:
+            del dependencies["write_narrative"]
+            dependencies["generate_report"] = ("store_filings", "create_charts")
+
+        self.timer = StepTimer()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(name: str, after: Tuple[str, ...]):
+            await asyncio.gather(*(tasks[dep] for dep in after))
+            step_input = self._input_hash(name, after)
+            saved = self.checkpoints.load(self.state.run_id, name, step_input)
+            if saved is not None:
+                logger.info(f"Step {name} restored from checkpoint")
+                for field, value in saved.items():
+                    setattr(self.state, field, value)
+            else:
+                with self.timer.step(name, after):
+                    await asyncio.to_thread(getattr(self, name))
+                self.checkpoints.save(
+                    self.state.run_id, name, step_input, self.state.model_dump(include=set(STEP_OUTPUTS[name]))
+                )
+            self.state.completed_steps.append(name)
+
+        for name, after in dependencies.items():
+            tasks[name] = asyncio.create_task(run_step(name, after))
+        await asyncio.gather(*tasks.values())
+
+        state = self.state
+        state.timings = self.timer.log_summary()
+        state.status = "completed"
+
+        return {
+            "run_id": state.run_id,
+            "report_path": state.report_path,
+            "chart_paths": ", ".join(state.chart_paths),
+            "sec_filings": len(state.sec_filings),
+            "insider_trades": len(state.insider_trades),
+            "timings": state.timings,
+            "status": state.status,
+        }
+
+    def _input_hash(self, name: str, after: Tuple[str, ...]) -> str:
+        """Hash of the run parameters and every field produced upstream of step `name`"""
+        upstream, pending = set(), list(after)
+        while pending:
+            dep = pending.pop()
+            if dep not in upstream:
+                upstream.add(dep)
+                pending.extend(STEP_DEPENDENCIES[dep])
+        fields = {field for dep in upstream for field in STEP_OUTPUTS[dep]}
+        return input_hash(
+            name,
+            self.state.model_dump(include={'hours_back', 'narrative_enabled'}),
+            self.state.model_dump(include=fields),
+        )
+
+    def fetch_sec_data(self):
+        self.state.sec_filings = sec_tools.SECFilingsTool().get_filings(self.state.hours_back)
+
+    def fetch_insider_trades(self):
+        self.state.insider_trades = sec_tools.InsiderTradingTool().get_trades(self.state.hours_back)
+
+    def store_filings(self):
+        self.storage.bulk_upsert_sec_filings(self.state.sec_filings)
+
+    def store_trades(self):
+        """Persist trades; the upsert also refreshes the rollups read by charts and the report"""
+        self.storage.bulk_upsert_trades(self.state.insider_trades)
+
+    def create_charts(self):
+        if not self.state.insider_trades:
+            logger.info("No insider trades, skipping charts")
+            return
+        self.state.chart_paths = chart_tools.ChartGenerationTool().create_charts(self.state.insider_trades)
+
+    def generate_report(self):
+        report_path = report_tools.ReportGenerationTool().generate_report(
+            self.state.sec_filings,
+            self.state.insider_trades,
+            ", ".join(self.state.chart_paths),
+            self.state.narrative,
+        )
+        self.state.report_path = str(report_path)
+
+    def summarize(self) -> Dict[str, Any]:
+        """Compact statistics used as the only LLM input in the narrative step"""
+        trades = self.state.insider_trades
+        company_value = Counter()
+        for trade in trades:
+            company_value[trade.get('company') or 'Unknown'] += trade.get('value') or 0
+        types = Counter(trade.get('transaction_type') for trade in trades)
+
+        return {
+            "sec_filings": len(self.state.sec_filings),
+            "insider_trades": len(trades),
+            "total_value": sum(company_value.values()),
+            "transaction_types": dict(types.most_common()),
+            "most_active_companies": company_value.most_common(5),
+        }
+
+    def write_narrative(self):
+        """Ask an LLM agent for a short commentary on the run's summary statistics"""
+        from crewai import Agent, Crew, Task
+
+        try:
+            analyst = Agent(
+                role="Insider Trading Analyst",
+                goal="Explain notable insider trading activity in plain language",
+                backstory="You are a financial analyst who writes concise market commentary.",
+                verbose=False,
+                max_iter=1,
+            )
+            task = Task(
+                description=f"""Write a short commentary (at most 5 sentences) on today's
+                insider trading activity, based on these summary statistics: {self.summarize()}""",
+                agent=analyst,
+                expected_output="A short plain-text market commentary",
+            )
+            self.state.narrative = str(Crew(agents=[analyst], tasks=[task], verbose=False).kickoff())
+        except Exception as e:
+            logger.error(f"Error writing narrative, continuing without it: {e}")
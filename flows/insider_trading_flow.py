@@ -1,41 +1,101 @@
+import asyncio
 from crewai import Crew, Task
-from crewai.flow import Flow, listen, start
+from crewai.flow import Flow, and_, listen, start
 from agents.sec_data_agent import SECDataAgent
 from agents.insider_trading_agent import InsiderTradingAgent  
 from agents.comparison_agent import ComparisonAgent
 from agents.report_agent import ReportAgent
 from utils.logger import setup_logger
+from utils.step_timer import StepTimer
+from data.llm_cache import install_litellm_cache
+from data.artifact_store import find_handle, get_artifact_store
+from data.checkpoints import get_checkpoint_store, input_hash, new_run_id
+from flows.state import InsiderTradingState
 from config.settings import settings
+import json
 import litellm
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Sequence
 
 logger = setup_logger(__name__)
 
 # Configure LiteLLM
 litellm.api_key = settings.OPENAI_API_KEY
 litellm.model = settings.LITELLM_MODEL
+install_litellm_cache(litellm)
 
-class InsiderTradingFlow(Flow):
-    """CrewAI Flow for insider trading analysis"""
+class InsiderTradingFlow(Flow[InsiderTradingState]):
+    """CrewAI Flow for insider trading analysis.
     
-    def __init__(self):
+    SEC filings and insider trades are retrieved concurrently, charts only
+    wait for the trades, and the report joins both branches. Each crew runs
+    in a worker thread so the branches overlap. Each step's output is
+    checkpointed under the run ID; constructing the flow with the ID of a
+    failed run skips the steps that already finished.
+    """
+    
+    def __init__(self, run_id: str = None):
         super().__init__()
+        self.checkpoints = get_checkpoint_store()
+        self.state.run_id = run_id or new_run_id()
+        if self.checkpoints.get_run(self.state.run_id) is not None:
+            logger.info(f"Resuming run {self.state.run_id}")
+        self.checkpoints.start_run(self.state.run_id, type(self).__name__, {})
         self.sec_agent = SECDataAgent.create_agent()
         self.insider_agent = InsiderTradingAgent.create_agent()
         self.comparison_agent = ComparisonAgent.create_agent()
         self.report_agent = ReportAgent.create_agent()
+        self.timer = StepTimer()
+        
+    async def _kickoff_crew(
+        self,
+        step: str,
+        crew: Crew,
+        output: str,
+        after: Sequence[str] = (),
+        inputs: Sequence[str] = (),
+        transform: Callable[[str], str] = str,
+    ) -> str:
+        """Run a crew in a worker thread as one timed, checkpointed flow step.
+        
+        The result is stored in state field `output`. If this run already
+        completed the step with the same `inputs` state fields, the
+        checkpointed value is restored instead of calling the crew.
+        """
+        step_input = input_hash(step, self.state.model_dump(include=set(inputs)))
+        saved = self.checkpoints.load(self.state.run_id, step, step_input)
+        if saved is not None:
+            logger.info(f"Step {step} restored from checkpoint")
+            value = saved[output]
+        else:
+            with self.timer.step(step, after):
+                value = transform(str(await asyncio.to_thread(crew.kickoff)))
+            self.checkpoints.save(self.state.run_id, step, step_input, {output: value})
+        
+        setattr(self.state, output, value)
+        self.state.completed_steps.append(step)
+        return value
+    
+    def _reference(self, result: str) -> str:
+        """Compact stand-in for a step's output: its artifact handle plus summary"""
+        handle = find_handle(result)
+        if handle is None:
+            logger.warning("Step output has no artifact handle; passing it on verbatim")
+            return result
+        summary = json.dumps(get_artifact_store().summary(handle), separators=(',', ':'), default=str)
+        return f"{handle} (summary: {summary})"
         
     @start()
-    def fetch_sec_data(self) -> Dict[str, Any]:
+    async def fetch_sec_data(self) -> Dict[str, Any]:
         """Start the flow by fetching SEC data"""
         logger.info("Starting SEC data retrieval...")
         
         task = Task(
             description="""Retrieve SEC filing data from the last 24 hours. 
             Focus on recent filings that might indicate insider trading activity.
-            Return the data in JSON format with company names, filing types, and dates.""",
+            The tool stores the full data and returns an artifact handle with a summary;
+            return that handle and summary exactly as the tool gave them.""",
             agent=self.sec_agent,
-            expected_output="JSON formatted SEC filings data from last 24 hours"
+            expected_output="Artifact handle and summary of SEC filings data from last 24 hours"
         )
         
         crew = Crew(
@@ -44,31 +104,31 @@ class InsiderTradingFlow(Flow):
             verbose=True
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff_crew("fetch_sec_data", crew, "sec_data", transform=self._reference)
         logger.info("SEC data retrieval completed")
         
         return {
-            "sec_data": str(result),
+            "sec_data": result,
             "status": "completed"
         }
     
-    @listen(fetch_sec_data)
-    def analyze_insider_trading(self, sec_context: Dict[str, Any]) -> Dict[str, Any]:
+    @start()
+    async def analyze_insider_trading(self) -> Dict[str, Any]:
         """Analyze insider trading activity based on SEC data"""
         logger.info("Starting insider trading analysis...")
         
         task = Task(
-            description=f"""Analyze insider trading activity from Form 4 filings in the last 24 hours.
-            Use the SEC data context: {sec_context['sec_data']}
+            description="""Analyze insider trading activity from Form 4 filings in the last 24 hours.
             
             Identify:
             - Key insider transactions (buys/sells)
             - Transaction volumes and values
             - Notable patterns or unusual activity
             
-            Return detailed insider trading data in JSON format.""",
+            The tool stores the full data and returns an artifact handle with a summary;
+            include that artifact handle verbatim in your answer.""",
             agent=self.insider_agent,
-            expected_output="JSON formatted insider trading analysis with transaction details"
+            expected_output="Insider trading analysis with the artifact handle of the transaction data"
         )
         
         crew = Crew(
@@ -77,17 +137,18 @@ class InsiderTradingFlow(Flow):
             verbose=True
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff_crew(
+            "analyze_insider_trading", crew, "insider_data", transform=self._reference
+        )
         logger.info("Insider trading analysis completed")
         
         return {
-            "sec_data": sec_context["sec_data"],
-            "insider_data": str(result),
+            "insider_data": result,
             "status": "completed"
         }
     
     @listen(analyze_insider_trading)
-    def create_comparisons(self, analysis_context: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_comparisons(self) -> Dict[str, Any]:
         """Create charts comparing current and historical data"""
         logger.info("Starting chart generation...")
         
@@ -95,13 +156,16 @@ class InsiderTradingFlow(Flow):
             description=f"""Create comprehensive charts and visualizations comparing 
             current insider trading activity with historical patterns.
             
-            Current insider trading data: {analysis_context['insider_data']}
+            Current insider trading data (pass the artifact handle to the chart tool):
+            {self.state.insider_data}
             
             Generate:
             - Trading volume charts by company
             - Transaction value distributions
             - Transaction type breakdowns
             - Time-based activity patterns
+            - Today's buying and selling per ticker against the trailing baseline
+              (pass baseline_days={settings.ROLLUP_BASELINE_DAYS} for a {settings.ROLLUP_BASELINE_DAYS}-day baseline)
             
             Save all charts and return the file paths.""",
             agent=self.comparison_agent,
@@ -114,29 +178,32 @@ class InsiderTradingFlow(Flow):
             verbose=True
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff_crew(
+            "create_comparisons", crew, "chart_paths",
+            after=["analyze_insider_trading"], inputs=["insider_data"]
+        )
         logger.info("Chart generation completed")
         
         return {
-            "sec_data": analysis_context["sec_data"],
-            "insider_data": analysis_context["insider_data"],
-            "chart_paths": str(result),
+            "insider_data": self.state.insider_data,
+            "chart_paths": result,
             "status": "completed"
         }
     
-    @listen(create_comparisons)
-    def generate_final_report(self, chart_context: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate the final comprehensive report"""
+    @listen(and_(fetch_sec_data, create_comparisons))
+    async def generate_final_report(self) -> Dict[str, Any]:
+        """Generate the final comprehensive report once both branches have finished"""
         logger.info("Starting final report generation...")
+        state = self.state
         
         task = Task(
             description=f"""Generate a comprehensive insider trading analysis report 
             incorporating all collected data and visualizations.
             
-            Include:
-            - SEC filings data: {chart_context['sec_data']}
-            - Insider trading analysis: {chart_context['insider_data']}
-            - Generated charts: {chart_context['chart_paths']}
+            Include (pass the artifact handles to the report tool as-is):
+            - SEC filings data: {state.sec_data}
+            - Insider trading analysis: {state.insider_data}
+            - Generated charts: {state.chart_paths}
             
             Create a professional HTML report with:
             - Executive summary with key metrics
@@ -156,13 +223,18 @@ class InsiderTradingFlow(Flow):
             verbose=True
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff_crew(
+            "generate_final_report", crew, "report_path",
+            after=["fetch_sec_data", "create_comparisons"], inputs=["sec_data", "insider_data", "chart_paths"]
+        )
         logger.info("Final report generation completed")
         
         return {
-            "report_path": str(result),
-            "sec_data": chart_context["sec_data"],
-            "insider_data": chart_context["insider_data"],
-            "chart_paths": chart_context["chart_paths"],
+            "run_id": state.run_id,
+            "report_path": result,
+            "sec_data": state.sec_data,
+            "insider_data": state.insider_data,
+            "chart_paths": state.chart_paths,
+            "timings": self.timer.log_summary(),
             "status": "completed"
         }
\ No newline at end of file
@@ -0,0 +1,27 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class InsiderTradingState(BaseModel):
+    """State of the agent flow; each field is filled in by one step"""
+    run_id: str = ""
+    sec_data: str = ""
+    insider_data: str = ""
+    chart_paths: str = ""
+    report_path: str = ""
+    completed_steps: List[str] = Field(default_factory=list)
+
+
+class FastFlowState(BaseModel):
+    """Typed data handed from one fast-path step to the next"""
+    run_id: str = ""
+    hours_back: int = 24
+    narrative_enabled: bool = False
+    sec_filings: List[Dict[str, Any]] = Field(default_factory=list)
+    insider_trades: List[Dict[str, Any]] = Field(default_factory=list)
+    chart_paths: List[str] = Field(default_factory=list)
+    narrative: Optional[str] = None
+    report_path: Optional[str] = None
+    completed_steps: List[str] = Field(default_factory=list)
+    timings: Dict[str, Any] = Field(default_factory=dict)
+    status: str = "pending"
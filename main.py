@@ -1,5 +1,8 @@
+import argparse
 import asyncio
 import os
+import re
+import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -7,20 +10,25 @@ from pathlib import Path
 # Add project root to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from flows.insider_trading_flow import InsiderTradingFlow
 from utils.logger import setup_logger
 from config.settings import settings
 from data.storage import DataStorage
-import litellm
-
-# Configure LiteLLM
-litellm.api_key = settings.OPENAI_API_KEY
+from data.llm_cache import get_llm_cache, install_litellm_cache
+from data.checkpoints import get_checkpoint_store, new_run_id
 
 logger = setup_logger(__name__)
 
-def check_environment():
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def configure_litellm():
+    """Configure LiteLLM; only runs that call an LLM pay for importing it"""
+    import litellm
+    litellm.api_key = settings.OPENAI_API_KEY
+    install_litellm_cache(litellm)
+
+def check_environment(uses_llm: bool = True):
     """Check if all required environment variables are set"""
-    required_vars = ['OPENAI_API_KEY', 'SEC_USER_AGENT']
+    required_vars = ['OPENAI_API_KEY', 'SEC_USER_AGENT'] if uses_llm else ['SEC_USER_AGENT']
     missing_vars = []
     
     for var in required_vars:
@@ -45,27 +53,115 @@ def print_banner():
     """
     print(banner)
 
-async def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="CrowdWisdomTrading insider trading analysis")
+    parser.add_argument("--mode", choices=["fast", "agents"], default=settings.FLOW_MODE,
+                        help="fast: call tools directly; agents: run every step through an LLM crew")
+    parser.add_argument("--narrative", action="store_true", default=settings.FLOW_NARRATIVE,
+                        help="In fast mode, add an LLM-written commentary to the report")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume a failed run, skipping the steps it already completed")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running and ingest new Form 4 filings as EDGAR publishes them")
+    parser.add_argument("--interval", type=float, default=settings.DAEMON_POLL_INTERVAL,
+                        help="Seconds between polls in daemon mode")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"),
+                        type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        help="Load historical Form 4 trades filed between two YYYY-MM-DD dates")
+    parser.add_argument("--shard", choices=["day", "quarter"], default=settings.BACKFILL_SHARD,
+                        help="Backfill shard size")
+    parser.add_argument("--workers", type=int, default=settings.BACKFILL_WORKERS,
+                        help="Backfill shards processed concurrently")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import-time breakdown of starting the given command, then exit")
+    parser.add_argument("--imports-only", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def command_modules(args):
+    """Modules the selected command imports before it starts working"""
+    if args.daemon:
+        return ["flows.daemon"]
+    if args.backfill:
+        return ["flows.backfill"]
+    if args.mode == "agents":
+        return ["litellm", "flows.insider_trading_flow"]
+    return ["litellm", "flows.fast_flow"] if args.narrative else ["flows.fast_flow"]
+
+def profile_startup(argv, top: int = 20):
+    """Re-run the command under -X importtime up to the point where it starts working
+    and print where the startup time went, per top-level package"""
+    argv = [arg for arg in argv if arg != "--profile-startup"]
+    command = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), *argv, "--imports-only"]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    
+    packages = {}
+    slowest = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = int(match[1]), int(match[2]), match[3], match[4]
+        root = module.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+        if len(indent) == 1:
+            slowest.append((cumulative_us, module))
+    
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:])
+        sys.exit(completed.returncode)
+    
+    total = sum(packages.values())
+    print(f"Startup imports: {total / 1e6:.3f}s across {len(packages)} top-level packages")
+    print(f"\n{'self (ms)':>10}  {'share':>6}  package")
+    for root, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{self_us / 1000:>10.1f}  {self_us / total:>6.1%}  {root}")
+    print(f"\n{'cumul (ms)':>10}  top-level import")
+    for cumulative_us, module in sorted(slowest, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>10.1f}  {module}")
+
+async def main(args=None):
     """Main execution function"""
+    args = args or parse_args([])
     print_banner()
     logger.info("Starting CrowdWisdomTrading AI Agent...")
     
+    run_id = args.resume or new_run_id()
+    if args.resume:
+        run = get_checkpoint_store().get_run(args.resume)
+        if run is None:
+            logger.error(f"No checkpoints found for run {args.resume}")
+            sys.exit(1)
+        # The flow restores the run's stored parameters, so the LLM check must follow them too
+        args.mode = "agents" if run['flow'] == "InsiderTradingFlow" else "fast"
+        args.narrative = bool(run['params'].get('narrative_enabled', False))
+        logger.info(f"Resuming {args.mode} run {run_id}")
+    
     # Check environment
-    if not check_environment():
+    uses_llm = args.mode == "agents" or args.narrative
+    if not check_environment(uses_llm=uses_llm):
         sys.exit(1)
+    if uses_llm:
+        configure_litellm()
     
     try:
         # Initialize data storage
         storage = DataStorage()
         logger.info("Data storage initialized")
         
-        # Create and run the CrewAI flow
-        logger.info("Initializing CrewAI Flow...")
-        flow = InsiderTradingFlow()
+        # Create and run the flow
+        if args.mode == "fast":
+            from flows.fast_flow import FastInsiderTradingFlow
+            logger.info("Initializing deterministic fast-path flow...")
+            flow = FastInsiderTradingFlow(narrative=args.narrative, run_id=run_id)
+        else:
+            from flows.insider_trading_flow import InsiderTradingFlow
+            logger.info("Initializing CrewAI Flow...")
+            flow = InsiderTradingFlow(run_id=run_id)
         
         # Execute the flow
         logger.info("Starting insider trading analysis flow...")
-        result = flow.kickoff()
+        result = await flow.kickoff_async()
         
         logger.info("Flow execution completed successfully!")
         logger.info(f"Results: {result}")
@@ -74,9 +170,16 @@ async def main():
         print("\n" + "="*60)
         print("EXECUTION SUMMARY")
         print("="*60)
+        print(f"Run ID: {run_id}")
         print(f"Status: {result.get('status', 'Unknown')}")
         print(f"Report Path: {result.get('report_path', 'Not generated')}")
         print(f"Charts: {result.get('chart_paths', 'Not generated')}")
+        llm_cache = get_llm_cache()
+        if llm_cache is not None:
+            cache_stats = llm_cache.stats()
+            logger.info(f"LLM cache: {cache_stats}")
+            print(f"LLM Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%} hit rate)")
         print("="*60)
         
         return result
@@ -89,16 +192,59 @@ async def main():
     except Exception as e:
         logger.error(f"Error during execution: {e}")
         print(f"\nError: {e}")
+        print(f"Completed steps are checkpointed; resume with: python main.py --resume {run_id}")
+        sys.exit(1)
+
+def run_daemon(args):
+    """Run the polling ingester until interrupted"""
+    from flows.daemon import InsiderTradingDaemon
+    
+    print_banner()
+    if not check_environment(uses_llm=False):
+        sys.exit(1)
+    
+    daemon = InsiderTradingDaemon(interval=args.interval)
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Daemon interrupted by user")
+        daemon.stop()
+
+def run_backfill(args):
+    """Backfill historical trades; safe to interrupt and re-run"""
+    from flows.backfill import HistoricalBackfill
+    
+    print_banner()
+    if not check_environment(uses_llm=False):
         sys.exit(1)
+    
+    start_date, end_date = args.backfill
+    summary = HistoricalBackfill(start_date, end_date, granularity=args.shard, workers=args.workers).run()
+    if summary['failed']:
+        print(f"{len(summary['failed'])} shards failed; run the same command again to retry them")
+        sys.exit(1)
+    return summary
 
 def run_analysis():
     """Synchronous wrapper for the main function"""
+    args = parse_args()
+    if args.profile_startup:
+        return profile_startup(sys.argv[1:])
+    if args.imports_only:
+        for module in command_modules(args):
+            __import__(module)
+        return
+    if args.daemon:
+        return run_daemon(args)
+    if args.backfill:
+        return run_backfill(args)
+    
     try:
         # Run the async main function
         if sys.platform == "win32":
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
         
-        return asyncio.run(main())
+        return asyncio.run(main(args))
         
     except Exception as e:
         logger.error(f"Failed to run analysis: {e}")
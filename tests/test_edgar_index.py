@@ -0,0 +1,60 @@
+import logging
+from datetime import date
+
+import pytest
+
+from tools.edgar_index import daily_index_url, iter_index_filings
+from tools.sec_fetcher import FetchResponse
+
+MONDAY, TUESDAY = date(2024, 6, 3), date(2024, 6, 4)
+
+MASTER_INDEX = """Description: Daily Index of EDGAR Dissemination Feed
+CIK|Company Name|Form Type|Date Filed|File Name
+--------------------------------------------------------------------------------
+320193|Apple Inc.|4|20240603|edgar/data/320193/0000320193-24-000001.txt
+"""
+
+
+class StubFetcher:
+    """Serves one daily index and answers every other index URL with a fixed status"""
+
+    def __init__(self, status):
+        self.status = status
+
+    def download_sync(self, url, dest):
+        if url == daily_index_url(MONDAY):
+            dest.write_text(MASTER_INDEX, encoding='latin-1')
+            return FetchResponse(url=url, status=200, path=dest)
+        return FetchResponse(url=url, status=self.status, error=None if self.status else "timed out")
+
+
+def filings(status, strict=False):
+    return list(iter_index_filings(MONDAY, TUESDAY, fetcher=StubFetcher(status), strict=strict))
+
+
+@pytest.mark.parametrize("status", [403, 404])
+def test_missing_index_is_skipped_quietly(status, caplog):
+    with caplog.at_level(logging.DEBUG, logger="tools.edgar_index"):
+        result = filings(status)
+
+    assert [filing['accession_number'] for filing in result] == ["0000320193-24-000001"]
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+
+@pytest.mark.parametrize("status", [500, 0])
+def test_failed_index_download_is_reported(status, caplog):
+    with caplog.at_level(logging.DEBUG, logger="tools.edgar_index"):
+        result = filings(status)
+
+    assert len(result) == 1
+    assert [record.levelno for record in caplog.records if record.levelno >= logging.WARNING] == [logging.WARNING]
+
+
+def test_strict_mode_skips_only_404():
+    assert len(filings(404, strict=True)) == 1
+
+
+@pytest.mark.parametrize("status", [403, 500, 0])
+def test_strict_mode_raises_on_blocked_or_failed_download(status):
+    with pytest.raises(RuntimeError):
+        filings(status, strict=True)
@@ -0,0 +1,77 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from tools.form4_parser import iter_form4_trades, parse_form4
+
+FIXTURES = Path(__file__).parent / "fixtures" / "form4"
+
+
+def test_non_derivative_and_derivative_rows():
+    trades = parse_form4(FIXTURES / "sale_and_option_exercise.xml", "0001214128-24-000042")
+
+    # The nonDerivativeHolding row reports a position, not a transaction
+    assert len(trades) == 2
+    sale, exercise = trades
+    assert sale['company'] == 'Apple Inc.'
+    assert sale['ticker'] == 'AAPL'
+    assert sale['insider_name'] == 'Doe Jane'
+    assert sale['title'] == 'Chief Financial Officer, Director'
+    assert sale['transaction_date'] == '2024-03-01'
+    assert sale['transaction_type'] == 'Sale'
+    assert sale['acquired_disposed'] == 'D'
+    assert sale['is_derivative'] is False
+    assert sale['shares'] == 1000
+    assert sale['price'] == 180.5
+    assert sale['value'] == 180500
+    assert sale['shares_owned_after'] == 25000
+    assert sale['form_type'] == '4'
+    assert (sale['accession_number'], sale['line_number']) == ('0001214128-24-000042', 1)
+
+    assert exercise['transaction_type'] == 'Option Exercise'
+    assert exercise['security_title'] == 'Employee Stock Option (right to buy)'
+    assert exercise['is_derivative'] is True
+    assert exercise['shares'] == 500
+    assert exercise['value'] == 0
+    assert exercise['line_number'] == 2
+
+
+def test_footnote_only_price():
+    trade, = parse_form4(FIXTURES / "footnote_price.xml")
+
+    assert trade['transaction_type'] == 'Grant'
+    assert trade['shares'] == 2500
+    assert trade['price'] == 0
+    assert trade['value'] == 0
+    # Dates may carry a timezone offset, which is dropped
+    assert trade['transaction_date'] == '2024-02-15'
+    assert trade['form_type'] == '4/A'
+    assert trade['title'] == '10% Owner'
+
+
+def test_missing_ticker():
+    trade, = parse_form4(FIXTURES / "no_ticker.xml")
+
+    assert trade['ticker'] is None
+    assert trade['company'] == 'Example Private Holdings LLC'
+    assert trade['title'] == 'Member of 10% group'
+    assert trade['value'] == 122500
+
+
+def test_malformed_xml_raises_parse_error():
+    with pytest.raises(ET.ParseError):
+        parse_form4(FIXTURES / "malformed.xml")
+
+
+def test_full_submission_text_and_bytes_match_xml():
+    from_xml = parse_form4(FIXTURES / "sale_and_option_exercise.xml")
+
+    assert parse_form4(FIXTURES / "submission.txt") == from_xml
+    assert parse_form4((FIXTURES / "submission.txt").read_bytes()) == from_xml
+
+
+def test_iter_form4_trades_is_lazy():
+    trades = iter_form4_trades(FIXTURES / "sale_and_option_exercise.xml")
+    assert next(trades)['line_number'] == 1
+    trades.close()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+import tools.form4_pipeline as form4_pipeline
+from tools.form4_pipeline import fetch_and_parse
+from tools.sec_fetcher import FetchResponse
+
+FIXTURES = Path(__file__).parent / "fixtures" / "form4"
+
+DOCUMENTS = {
+    "0000000001-24-000001": "submission.txt",
+    "0000000002-24-000002": "footnote_price.xml",
+    "0000000003-24-000003": "no_ticker.xml",
+    "0000000004-24-000004": "malformed.xml",
+}
+
+
+class StubFetcher:
+    """Serves fixture documents by URL from a private event loop, like EdgarFetcher"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    async def fetch(self, url):
+        path = self.documents.get(url)
+        if path is None:
+            return FetchResponse(url=url, status=404)
+        return FetchResponse(url=url, status=200, body=path.read_bytes())
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def filing(accession_number):
+    return {
+        'accession_number': accession_number,
+        'filing_date': '2024-03-04',
+        'url': f"https://www.sec.gov/Archives/edgar/data/1/{accession_number}.txt",
+    }
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = StubFetcher({filing(accession)['url']: FIXTURES / name for accession, name in DOCUMENTS.items()})
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_fetch_and_parse_fixtures(fetcher, workers):
+    failed = set()
+    filings = [filing(accession) for accession in DOCUMENTS] + [filing("0000000005-24-000005")]
+    trades = list(fetch_and_parse(filings, workers=workers, chunk_size=2, fetcher=fetcher, failed=failed))
+
+    by_accession = {}
+    for trade in trades:
+        by_accession.setdefault(trade['accession_number'], []).append(trade)
+    assert {accession: len(rows) for accession, rows in by_accession.items()} == {
+        "0000000001-24-000001": 2,
+        "0000000002-24-000002": 1,
+        "0000000003-24-000003": 1,
+    }
+    assert all(trade['filing_date'] == '2024-03-04' for trade in trades)
+    # The malformed document and the missing one are reported, not raised
+    assert failed == {"0000000004-24-000004", "0000000005-24-000005"}
+
+
+def test_unexpected_parse_error_only_drops_that_document(fetcher, monkeypatch):
+    parse = form4_pipeline.iter_form4_trades
+
+    def flaky_parse(body, accession_number):
+        if accession_number == "0000000002-24-000002":
+            raise ValueError("unexpected value")
+        return parse(body, accession_number)
+
+    monkeypatch.setattr(form4_pipeline, 'iter_form4_trades', flaky_parse)
+    failed = set()
+    filings = [filing(accession) for accession in DOCUMENTS]
+    trades = list(fetch_and_parse(filings, workers=0, chunk_size=10, fetcher=fetcher, failed=failed))
+
+    assert sorted({trade['accession_number'] for trade in trades}) == [
+        "0000000001-24-000001", "0000000003-24-000003",
+    ]
+    assert failed == {"0000000002-24-000002", "0000000004-24-000004"}
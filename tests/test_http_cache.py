@@ -0,0 +1,80 @@
+import asyncio
+
+from data.http_cache import HTTPCache
+from tools.sec_fetcher import EdgarFetcher, FetchResponse
+from utils.rate_limiter import TokenBucket
+
+URL = "https://www.sec.gov/Archives/edgar/data/320193/0000320193-24-000001.txt"
+
+
+class StubServer:
+    """Answers like EDGAR: 304 when the client's ETag matches the current document"""
+
+    def __init__(self, body, etag):
+        self.body, self.etag = body, etag
+        self.requests = []
+
+    async def fetch(self, url, headers=None, dest=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == self.etag:
+            return FetchResponse(url=url, status=304, body=b"", headers={'ETag': self.etag})
+        return FetchResponse(url=url, status=200, body=self.body, headers={'ETag': self.etag})
+
+
+def make_fetcher(tmp_path, server):
+    fetcher = EdgarFetcher(cache=HTTPCache(db_path=tmp_path / "http_cache.db"), rate_limiter=TokenBucket(1000, 10))
+    fetcher._fetch = server.fetch
+    return fetcher
+
+
+def test_unchanged_document_is_served_from_cache_after_304(tmp_path):
+    server = StubServer(b"<ownershipDocument/>", '"v1"')
+    fetcher = make_fetcher(tmp_path, server)
+
+    first = asyncio.run(fetcher.fetch(URL))
+    second = asyncio.run(fetcher.fetch(URL))
+
+    assert (first.status, first.from_cache) == (200, False)
+    assert (second.status, second.body, second.from_cache) == (200, b"<ownershipDocument/>", True)
+    assert server.requests == [{}, {'If-None-Match': '"v1"'}]
+    assert fetcher.cache.stats()['hits'] == 1
+
+
+def test_changed_document_replaces_cached_copy(tmp_path):
+    server = StubServer(b"old", '"v1"')
+    fetcher = make_fetcher(tmp_path, server)
+    asyncio.run(fetcher.fetch(URL))
+
+    server.body, server.etag = b"new", '"v2"'
+    response = asyncio.run(fetcher.fetch(URL))
+
+    assert (response.body, response.from_cache) == (b"new", False)
+    assert fetcher.cache.conditional_headers(URL) == {'If-None-Match': '"v2"'}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(db_path=tmp_path / "http_cache.db", max_bytes=100)
+    for name in ("a", "b", "c"):
+        cache.store(f"{URL}/{name}", name.encode() * 40, {'ETag': name})
+
+    # "a" was evicted to fit "c"; re-adding it evicts "b", and using it leaves "c" the oldest
+    assert cache.load(f"{URL}/a") is None
+    cache.store(f"{URL}/a", b"a" * 40, {'ETag': 'a'})
+    assert cache.load(f"{URL}/b") is None
+    assert cache.load(f"{URL}/a") == b"a" * 40
+    cache.store(f"{URL}/d", b"d" * 40, {'ETag': 'd'})
+
+    assert cache.load(f"{URL}/c") is None
+    assert cache.load(f"{URL}/a") == b"a" * 40
+    assert cache.load(f"{URL}/d") == b"d" * 40
+    assert cache.stats()['size_bytes'] <= 100
+
+
+def test_oversized_and_unvalidated_responses_are_not_stored(tmp_path):
+    cache = HTTPCache(db_path=tmp_path / "http_cache.db", max_bytes=100)
+    cache.store(f"{URL}/big", b"x" * 101, {'ETag': 'big'})
+    cache.store(f"{URL}/plain", b"x", {})
+
+    assert cache.conditional_headers(f"{URL}/big") == {}
+    assert cache.conditional_headers(f"{URL}/plain") == {}
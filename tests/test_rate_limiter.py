@@ -0,0 +1,62 @@
+import pytest
+
+import utils.rate_limiter as rate_limiter
+from utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.on_sleep = None
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if self.on_sleep is not None:
+            hook, self.on_sleep = self.on_sleep, None
+            hook()
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def send_times(bucket, clock, count):
+    times = []
+    for _ in range(count):
+        bucket.acquire()
+        times.append(clock.now)
+    return times
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert send_times(bucket, clock, 6) == pytest.approx([0.0, 0.0, 0.1, 0.2, 0.3, 0.4])
+
+
+def test_pause_delays_new_reservations(clock):
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.pause(0.5)
+
+    assert send_times(bucket, clock, 2) == pytest.approx([0.5, 0.6])
+
+
+def test_pause_pushes_back_queued_reservation(clock):
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.acquire()
+
+    # Another worker hits a 429 while this one is waiting on its reservation for t=0.1
+    clock.on_sleep = lambda: bucket.pause(1.0)
+    bucket.acquire()
+    assert clock.now == pytest.approx(1.1)
+
+    # Later callers keep the original spacing behind the delayed one
+    assert send_times(bucket, clock, 2) == pytest.approx([1.2, 1.3])
@@ -0,0 +1,61 @@
+import re
+
+import pytest
+
+from config.settings import settings
+from tools.report_renderer import iter_report_html
+
+
+def make_trades(count):
+    return [
+        {
+            'company': f"Company {i % 4}",
+            'insider_name': f"Insider {i}",
+            'title': 'Director',
+            'transaction_type': 'Sale' if i % 2 else 'Purchase',
+            'transaction_date': '2024-06-03',
+            'shares': 100,
+            'price': 10.0,
+            'value': 1000.0 * (i + 1),
+        }
+        for i in range(count)
+    ]
+
+
+def render(trades, **kwargs):
+    html = "".join(iter_report_html([], trades, **kwargs))
+    # Drop the generation time so two renders can be compared
+    return re.sub(r"Report Generated: [^<]*", "", html)
+
+
+@pytest.mark.parametrize("page_size", [3, 500])
+def test_generator_renders_like_list(page_size):
+    trades = make_trades(10)
+
+    from_list = render(trades, page_size=page_size)
+    from_generator = render((trade for trade in trades), page_size=page_size)
+
+    assert from_generator == from_list
+    assert "Total Trades: 10" in from_list
+    assert from_list.count("<tr><td>Company") == 10 + 4  # table rows plus most active companies
+    assert from_list.count("<tbody") == -(-10 // page_size)
+
+
+class StubStorage:
+    def get_baseline_comparison(self, **kwargs):
+        return []
+
+
+def test_generate_report_accepts_generator(tmp_path, monkeypatch):
+    pytest.importorskip("crewai_tools")
+    import tools.report_tools as report_tools
+
+    monkeypatch.setattr(settings, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(report_tools, "DataStorage", StubStorage)
+    trades = make_trades(38)
+
+    path = report_tools.ReportGenerationTool().generate_report([], iter(trades))
+
+    html = path.read_text(encoding='utf-8')
+    assert "Detected 38 insider transactions" in html
+    assert html.count("<tr><td>Company") == 38 + 4
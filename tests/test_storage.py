@@ -0,0 +1,224 @@
+import sqlite3
+
+import pytest
+
+from config.settings import settings
+from data.storage import (
+    ROLLUP_DAY_BACKFILL_SQL,
+    ROLLUP_DIMENSIONS,
+    ROLLUP_WEEK_BACKFILL_SQL,
+    DataStorage,
+)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PARQUET_ENABLED", False)
+    return DataStorage(db_path=tmp_path / "trades.db")
+
+
+def trade(accession, line, ticker, transaction_date, transaction_type, value, insider="Insider A"):
+    return {
+        'company': f"{ticker} Corp" if ticker else "No Ticker Corp",
+        'ticker': ticker,
+        'insider_name': insider,
+        'title': 'Director',
+        'transaction_date': transaction_date,
+        'transaction_type': transaction_type,
+        'shares': 100,
+        'price': value / 100,
+        'value': value,
+        'accession_number': accession,
+        'line_number': line,
+    }
+
+
+# company_name is a display label (the latest one written wins), so only the measures are compared
+ROLLUP_QUERY = """
+    SELECT period, period_start, dimension, key, trade_count, ROUND(shares, 6), ROUND(value, 6),
+           buy_count, ROUND(buy_value, 6), sell_count, ROUND(sell_value, 6)
+    FROM trade_rollups
+    ORDER BY period, dimension, period_start, key
+"""
+
+
+def rollups(storage):
+    conn = sqlite3.connect(storage.db_path)
+    try:
+        return conn.execute(ROLLUP_QUERY).fetchall()
+    finally:
+        conn.close()
+
+
+def rebuilt_rollups(storage):
+    """Rollups recomputed from scratch from the stored trades, as when the table is first created"""
+    conn = sqlite3.connect(storage.db_path)
+    try:
+        conn.execute("DELETE FROM trade_rollups")
+        for dimension, column in ROLLUP_DIMENSIONS.items():
+            conn.execute(ROLLUP_DAY_BACKFILL_SQL.format(key=column), (dimension,))
+        conn.execute(ROLLUP_WEEK_BACKFILL_SQL)
+        return conn.execute(ROLLUP_QUERY).fetchall()
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def test_rollup_deltas_match_full_rebuild(storage):
+    storage.bulk_upsert_trades([
+        trade("0000000001-24-000001", 1, "AAA", "2024-06-03", "Purchase", 1000),
+        trade("0000000001-24-000001", 2, "AAA", "2024-06-03", "Sale", 2500),
+        trade("0000000002-24-000002", 1, "BBB", "2024-06-07", "Sale", 4000, insider="Insider B"),
+        trade("0000000003-24-000003", 1, "CCC", "2024-06-10", "Purchase", 700),
+        trade("0000000004-24-000004", 1, None, "2024-06-04", "Purchase", 300),
+        trade("0000000005-24-000005", 1, "DDD", "2024-02-30", "Sale", 900),
+    ], chunk_size=2)
+    assert rollups(storage) == rebuilt_rollups(storage)
+
+    storage.bulk_upsert_trades([
+        # Moved to another ticker, leaving BBB's buckets empty
+        trade("0000000002-24-000002", 1, "AAA", "2024-06-07", "Sale", 4000, insider="Insider B"),
+        # Moved to a day in the previous week
+        trade("0000000003-24-000003", 1, "CCC", "2024-06-05", "Purchase", 700),
+        # New value and type on an existing row
+        trade("0000000001-24-000001", 1, "AAA", "2024-06-03", "Sale", 1500),
+        # Unchanged re-upsert and a brand new row in the same batch
+        trade("0000000001-24-000001", 2, "AAA", "2024-06-03", "Sale", 2500),
+        trade("0000000006-24-000006", 1, "CCC", "2024-06-11", "Sale", 1200),
+    ], chunk_size=2)
+    assert rollups(storage) == rebuilt_rollups(storage)
+    assert not [row for row in rollups(storage) if row[3] == "BBB"]
+
+    before = rollups(storage)
+    storage.bulk_upsert_trades([
+        trade("0000000002-24-000002", 1, "AAA", "2024-06-07", "Sale", 4000, insider="Insider B"),
+        trade("0000000006-24-000006", 1, "CCC", "2024-06-11", "Sale", 1200),
+    ])
+    assert rollups(storage) == before == rebuilt_rollups(storage)
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE sec_filings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        cik TEXT, company_name TEXT, form_type TEXT, filing_date TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE insider_trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_name TEXT, ticker TEXT, insider_name TEXT, insider_title TEXT,
+        transaction_date TEXT, transaction_type TEXT, shares INTEGER, price REAL, value REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+def count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_migration_removes_existing_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PARQUET_ENABLED", False)
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    filing = ('320193', 'Apple Inc.', '4', '2024-06-03')
+    conn.executemany("INSERT INTO sec_filings (cik, company_name, form_type, filing_date) VALUES (?, ?, ?, ?)",
+                     [filing, filing, ('789019', 'Microsoft Corp', '4', '2024-06-03')])
+    legacy_trade = ('Apple Inc.', 'AAPL', 'Insider A', 'Director', '2024-06-03', 'Sale', 100, 10.0, 1000.0)
+    conn.executemany("""
+        INSERT INTO insider_trades (company_name, ticker, insider_name, insider_title, transaction_date,
+                                    transaction_type, shares, price, value)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [legacy_trade] * 3 + [legacy_trade[:5] + ('Purchase', 50, 10.0, 500.0)])
+    conn.commit()
+    conn.close()
+
+    storage = DataStorage(db_path=db_path)
+
+    assert count(db_path, "sec_filings") == 2
+    assert count(db_path, "insider_trades") == 2
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] >= 2
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO insider_trades (accession_number, line_number) "
+                         "SELECT accession_number, line_number FROM insider_trades LIMIT 1")
+        assert conn.execute("""
+            SELECT trade_count, value FROM trade_rollups
+            WHERE period = 'day' AND dimension = 'ticker' AND key = 'AAPL'
+        """).fetchone() == (2, 1500.0)
+    finally:
+        conn.close()
+
+    # Legacy rows are keyed on their content, so writing the same trade again updates it in place
+    storage.bulk_upsert_trades([{
+        'company': 'Apple Inc.', 'ticker': 'AAPL', 'insider_name': 'Insider A', 'title': 'Director',
+        'transaction_date': '2024-06-03', 'transaction_type': 'Sale', 'shares': 100, 'price': 10.0, 'value': 1000.0,
+    }])
+    assert count(db_path, "insider_trades") == 2
+
+
+def test_upserts_are_idempotent(storage):
+    filings = [
+        {'cik': 320193, 'company': 'Apple Inc.', 'form': '4', 'filing_date': '2024-06-03',
+         'accession_number': '0000320193-24-000001'},
+        {'cik': 789019, 'company': 'Microsoft Corp', 'form': '4', 'filing_date': '2024-06-03',
+         'accession_number': '0000789019-24-000002'},
+    ]
+    trades = [
+        trade("0000320193-24-000001", 1, "AAPL", "2024-06-03", "Sale", 1000),
+        trade("0000320193-24-000001", 2, "AAPL", "2024-06-03", "Purchase", 500),
+        trade("0000789019-24-000002", 1, "MSFT", "2024-06-03", "Sale", 2000),
+    ]
+
+    def snapshot():
+        conn = sqlite3.connect(storage.db_path)
+        try:
+            return (
+                conn.execute("SELECT * FROM sec_filings ORDER BY id").fetchall(),
+                conn.execute("SELECT * FROM insider_trades ORDER BY id").fetchall(),
+            )
+        finally:
+            conn.close()
+
+    storage.bulk_upsert_sec_filings(filings)
+    storage.bulk_upsert_trades(trades)
+    first = snapshot()
+    first_rollups = rollups(storage)
+
+    storage.bulk_upsert_sec_filings(filings)
+    storage.bulk_upsert_trades(trades + trades)
+    assert snapshot() == first
+    assert rollups(storage) == first_rollups
+
+    # A changed trade replaces its row under the same id instead of adding one
+    storage.bulk_upsert_trades([trade("0000789019-24-000002", 1, "MSFT", "2024-06-03", "Sale", 3000)])
+    filings_after, trades_after = snapshot()
+    assert filings_after == first[0]
+    assert [row[0] for row in trades_after] == [row[0] for row in first[1]]
+    assert trades_after[2][9] == 3000.0
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'start_date': '2024-06-01', 'end_date': '2024-06-30', 'min_value': 1000},
+    {'ticker': 'AAPL', 'start_date': '2024-06-01'},
+    {'insider': 'Insider A'},
+])
+def test_trade_queries_are_served_in_index_order(storage, filters):
+    where, params = storage._trade_filters(**filters)
+    conn = sqlite3.connect(storage.db_path)
+    try:
+        plan = [row[3] for row in conn.execute(f"""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM insider_trades {where} ORDER BY transaction_date DESC, id DESC
+        """, params)]
+    finally:
+        conn.close()
+
+    assert any("USING INDEX" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from typing import Optional
+from data.storage import DataStorage
+from utils.lazy_import import lazy_import
+from config.settings import settings
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# z-score given to activity on a day whose baseline window had no variation at all
+FLAT_BASELINE_ZSCORE = 10.0
+
+
+def rolling_zscores(values: "np.ndarray", window: int) -> "np.ndarray":
+    """z-score of each day's value against the `window` days before it, for every row at once.
+
+    `values` is a (keys x days) matrix of daily totals with zeros for days
+    without activity. Columns without a full trailing window are NaN. When
+    the window is flat (zero deviation), days above it get
+    FLAT_BASELINE_ZSCORE and the rest get 0.
+    """
+    values = np.asarray(values, dtype=float)
+    zscores = np.full(values.shape, np.nan)
+    if values.shape[1] <= window:
+        return zscores
+
+    # windows[:, t] covers days t .. t + window - 1, the baseline of day t + window
+    windows = np.lib.stride_tricks.sliding_window_view(values[:, :-1], window, axis=1)
+    mean = windows.mean(axis=2)
+    std = windows.std(axis=2)
+    current = values[:, window:]
+
+    flat = std == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (current - mean) / std
+    scores[flat] = np.where(current[flat] > mean[flat], FLAT_BASELINE_ZSCORE, 0.0)
+    zscores[:, window:] = scores
+    return zscores
+
+
+def compare_to_baseline(
+    as_of: Optional[str] = None,
+    baseline_days: Optional[int] = None,
+    storage: Optional[DataStorage] = None,
+    dimension: str = 'ticker',
+) -> "pd.DataFrame":
+    """Per-key buy and sell z-scores of `as_of` against the trailing `baseline_days` days.
+
+    The daily rollups of every key active on `as_of` are read once into
+    dense (keys x days) arrays, so the cost is one range scan plus a few
+    NumPy passes over the whole universe, with no per-key Python loop.
+    """
+    baseline_days = baseline_days or settings.ROLLUP_BASELINE_DAYS
+    as_of_date = date.fromisoformat(as_of) if as_of else date.today()
+    start_date = as_of_date - timedelta(days=baseline_days)
+    storage = storage or DataStorage()
+
+    columns = ['key', 'company_name', 'today_buy_value', 'today_sell_value', 'baseline_buy_value',
+               'baseline_sell_value', 'buy_zscore', 'sell_zscore', 'baseline_days']
+    today = storage.get_rollups('day', dimension, as_of_date.isoformat(), as_of_date.isoformat())
+    today = [row for row in today if row['buy_value'] or row['sell_value']]
+    if not today:
+        return pd.DataFrame(columns=columns)
+
+    # Only keys active on as_of are compared, so only their series are loaded
+    rows = storage.get_daily_buy_sell(start_date.isoformat(), as_of_date.isoformat(), dimension,
+                                      active_on=as_of_date.isoformat())
+    day_index, keys, buys, sells = zip(*rows)
+    key_index, unique_keys = pd.factorize(pd.Index(keys))
+
+    shape = (len(unique_keys), baseline_days + 1)
+    buy = np.zeros(shape)
+    sell = np.zeros(shape)
+    day_index = np.asarray(day_index)
+    buy[key_index, day_index] = np.asarray(buys, dtype=float)
+    sell[key_index, day_index] = np.asarray(sells, dtype=float)
+
+    active = (buy[:, -1] > 0) | (sell[:, -1] > 0)
+    company_names = {row['key']: row['company_name'] for row in today}
+
+    frame = pd.DataFrame({
+        'key': unique_keys[active],
+        'company_name': [company_names.get(key) for key in unique_keys[active]],
+        'today_buy_value': buy[active, -1],
+        'today_sell_value': sell[active, -1],
+        'baseline_buy_value': buy[active, :-1].mean(axis=1),
+        'baseline_sell_value': sell[active, :-1].mean(axis=1),
+        'buy_zscore': rolling_zscores(buy[active], baseline_days)[:, -1],
+        'sell_zscore': rolling_zscores(sell[active], baseline_days)[:, -1],
+        'baseline_days': baseline_days,
+    }, columns=columns)
+    return frame.sort_values('key', ignore_index=True)
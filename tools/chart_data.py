@@ -0,0 +1,90 @@
+import math
+from typing import List, Sequence, Tuple
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# Vectorized reductions that turn any number of trades into a bounded number of chart points
+
+
+def format_money(value: float) -> str:
+    """Short dollar label: $950, $12K, $3.4M, $1.2B"""
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= threshold:
+            return f"${value / threshold:.3g}{suffix}"
+    return f"${value:.3g}"
+
+
+def log_value_bins(values: Sequence[float], bins_per_decade: int = 4) -> Tuple[List[str], List[int]]:
+    """Histogram of values on log-spaced bins, with non-positive values counted in a "$0" bin.
+
+    The number of bins grows with the number of decades the values span
+    (at most a few dozen), not with the number of values.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    positive = values[values > 0]
+    zero_count = int(values.size - positive.size)
+
+    labels, counts = [], []
+    if zero_count:
+        labels.append("$0")
+        counts.append(zero_count)
+    if positive.size:
+        logs = np.log10(positive)
+        low = math.floor(logs.min() * bins_per_decade) / bins_per_decade
+        high = math.ceil(logs.max() * bins_per_decade) / bins_per_decade
+        edges = np.arange(low, max(high, low + 1 / bins_per_decade) + 1e-9, 1 / bins_per_decade)
+        hist, _ = np.histogram(logs, bins=edges)
+        for start, end, count in zip(edges[:-1], edges[1:], hist):
+            labels.append(f"{format_money(10 ** start)}-{format_money(10 ** end)}")
+            counts.append(int(count))
+    return labels, counts
+
+
+def top_n_with_other(labels: Sequence, values: Sequence[float], n: int) -> Tuple[List, List[float]]:
+    """The n largest values, largest first, plus an "Other (k)" entry summing the rest"""
+    values = np.asarray(values, dtype=float)
+    if values.size <= n:
+        order = np.argsort(values)[::-1]
+        return [labels[i] for i in order], values[order].tolist()
+
+    top = np.argpartition(values, -n)[-n:]
+    top = top[np.argsort(values[top])[::-1]]
+    rest = np.ones(values.size, dtype=bool)
+    rest[top] = False
+    return (
+        [labels[i] for i in top] + [f"Other ({int(rest.sum()):,})"],
+        values[top].tolist() + [float(values[rest].sum())],
+    )
+
+
+def lttb(x: Sequence[float], y: Sequence[float], threshold: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Downsample a series to `threshold` points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if threshold >= x.size or threshold < 3:
+        return x, y
+
+    # Bucket boundaries for every point except the first and last
+    edges = np.linspace(1, x.size - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, x.size - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else x.size
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return x[selected], y[selected]
@@ -1,72 +1,205 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List
+import hashlib
+from typing import Dict, List, Optional, Tuple
 from crewai_tools import BaseTool
-import json
+import os
+import threading
 from pathlib import Path
 from utils.logger import setup_logger
 from config.settings import settings
+from data.artifact_store import resolve
+from utils.lazy_import import lazy_import
+from tools.baseline_comparison import compare_to_baseline
+from tools.chart_data import log_value_bins, lttb, top_n_with_other
+from utils.executors import make_executor
 
 logger = setup_logger(__name__)
 
+# Plotting libraries are only imported once a chart is actually drawn
+plotly = lazy_import("plotly")
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+pd = lazy_import("pandas")
+
+# Bump when chart code changes, so content-addressed outputs from older code are not reused
+CHART_CACHE_VERSION = 2
+
+# Chart name -> (method that builds the figure, DataFrame columns it needs)
+CHART_SPECS: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("trading_volume", "_create_volume_chart", ("company", "shares")),
+    ("value_distribution", "_create_value_distribution_chart", ("value",)),
+    ("transaction_types", "_create_transaction_type_chart", ("transaction_type",)),
+    ("activity_timeline", "_create_activity_timeline_chart", ("transaction_date", "value")),
+    ("baseline_zscores", "_create_baseline_zscore_chart", ("transaction_date",)),
+)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <script src="{plotlyjs}"></script>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        .panel {{ margin-bottom: 30px; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+{panels}</body>
+</html>
+"""
+
+_plotlyjs_lock = threading.Lock()
+
+def _write_atomic(path: Path, text: str):
+    """Write via a temporary file so concurrent runs never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def shared_plotlyjs() -> str:
+    """Name of the plotly.js bundle in CHARTS_DIR that every chart page loads, writing it on first use.
+
+    The file name carries the plotly version, so browsers can cache it and an
+    upgrade writes a new bundle instead of reusing a stale one.
+    """
+    name = f"plotly-{plotly.__version__}.min.js"
+    bundle_path = settings.CHARTS_DIR / name
+    with _plotlyjs_lock:
+        if not bundle_path.exists():
+            _write_atomic(bundle_path, plotly.offline.get_plotlyjs())
+    return name
+
+def _render_chart(method: str, df: "pd.DataFrame", div_id: str) -> str:
+    """Build one figure and serialize it to an HTML fragment; runs in a chart worker process"""
+    fig = getattr(ChartGenerationTool(), method)(df)
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
+
 class ChartGenerationTool(BaseTool):
     name: str = "Chart Generation Tool"
-    description: str = "Creates charts comparing current and historical insider trading data"
+    description: str = (
+        "Creates charts comparing current and historical insider trading data. "
+        "Accepts an artifact handle for the trades; baseline_days is the number of "
+        f"trailing days to compare against (default {settings.ROLLUP_BASELINE_DAYS})."
+    )
     
-    def _run(self, current_data: str, historical_data: str = None) -> str:
+    def _run(self, current_data: str, baseline_days: int = settings.ROLLUP_BASELINE_DAYS) -> str:
         """Generate comparison charts for insider trading data"""
         try:
-            current_trades = json.loads(current_data)
+            current_trades = resolve(current_data)
             
             if not current_trades:
                 return "No current data available for chart generation"
             
-            # Create DataFrame
-            df = pd.DataFrame(current_trades)
-            
-            # Generate multiple chart types
-            charts_created = []
-            
-            # 1. Trading Volume by Company
-            if 'company' in df.columns and 'shares' in df.columns:
-                fig1 = self._create_volume_chart(df)
-                chart1_path = settings.CHARTS_DIR / f"trading_volume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-                fig1.write_html(str(chart1_path))
-                charts_created.append(str(chart1_path))
-            
-            # 2. Transaction Value Distribution
-            if 'value' in df.columns:
-                fig2 = self._create_value_distribution_chart(df)
-                chart2_path = settings.CHARTS_DIR / f"value_distribution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-                fig2.write_html(str(chart2_path))
-                charts_created.append(str(chart2_path))
-            
-            # 3. Transaction Types Pie Chart
-            if 'transaction_type' in df.columns:
-                fig3 = self._create_transaction_type_chart(df)
-                chart3_path = settings.CHARTS_DIR / f"transaction_types_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-                fig3.write_html(str(chart3_path))
-                charts_created.append(str(chart3_path))
-            
-            logger.info(f"Created {len(charts_created)} charts")
+            charts_created = self.create_charts(current_trades, baseline_days)
             return f"Charts created successfully: {', '.join(charts_created)}"
             
         except Exception as e:
             logger.error(f"Error creating charts: {e}")
             return f"Error creating charts: {str(e)}"
     
-    def _create_volume_chart(self, df: pd.DataFrame):
-        """Create trading volume chart"""
-        volume_by_company = df.groupby('company')['shares'].sum().sort_values(ascending=False)
+    def create_charts(self, current_trades: List[Dict], baseline_days: Optional[int] = None) -> List[str]:
+        """Render the charts for a list of trades and return the paths of the files written.
+
+        Output files are named by a hash of each chart's input data, so charts
+        whose inputs have not changed since an earlier run are reused as they
+        are. Charts that do need rendering are built in parallel in a worker pool.
+        """
+        # Create DataFrame
+        df = pd.DataFrame(current_trades)
+        inputs = {
+            name: self._chart_input(name, df, columns, baseline_days)
+            for name, _, columns in CHART_SPECS
+            if all(column in df.columns for column in columns)
+        }
+        charts = [chart for chart in CHART_SPECS if inputs.get(chart[0]) is not None]
+        if not charts:
+            return []
+        
+        keys = {name: self._chart_key(name, inputs[name]) for name, _, _ in charts}
+        plotlyjs = shared_plotlyjs()
+        if settings.CHART_OUTPUT == "files":
+            pages = [
+                (settings.CHARTS_DIR / f"{name}_{keys[name][:16]}.html", name.replace('_', ' ').title(), [name])
+                for name, _, _ in charts
+            ]
+        else:
+            digest = hashlib.sha256("".join(keys[name] for name, _, _ in charts).encode()).hexdigest()
+            pages = [(settings.CHARTS_DIR / f"dashboard_{digest[:16]}.html", "Insider Trading Dashboard",
+                      [name for name, _, _ in charts])]
+        
+        missing = [page for page in pages if not page[0].exists()]
+        needed = {name for _, _, names in missing for name in names}
+        fragments = self._render_fragments([chart for chart in charts if chart[0] in needed], inputs, keys)
+        for path, title, names in missing:
+            panels = "".join(f'<div class="panel">{fragments[name]}</div>\n' for name in names)
+            _write_atomic(path, PAGE_TEMPLATE.format(title=title, plotlyjs=plotlyjs, panels=panels))
+        
+        logger.info(f"Charts: {len(pages) - len(missing)} files reused, {len(missing)} written")
+        return [str(path) for path, _, _ in pages]
+    
+    def _chart_input(self, name: str, df: "pd.DataFrame", columns: Tuple[str, ...],
+                     baseline_days: Optional[int] = None):
+        """DataFrame a chart is drawn from, or None when there is nothing to draw"""
+        if name == "trading_volume":
+            return self._company_volume(df)
+        if name != "baseline_zscores":
+            return df[list(columns)]
+        dates = df['transaction_date'].dropna()
+        if dates.empty:
+            return None
+        try:
+            comparison = compare_to_baseline(as_of=dates.max(), baseline_days=baseline_days)
+        except Exception as e:
+            logger.warning(f"Could not compare activity with the baseline: {e}")
+            return None
+        return comparison if not comparison.empty else None
+    
+    def _chart_key(self, name: str, df: "pd.DataFrame") -> str:
+        """Content hash of everything one chart is drawn from"""
+        digest = hashlib.sha256(
+            f"{CHART_CACHE_VERSION}|{name}|{plotly.__version__}|{settings.CHART_TOP_N}|"
+            f"{settings.CHART_MAX_POINTS}|{settings.CHART_VALUE_BINS_PER_DECADE}|{list(df.columns)}".encode()
+        )
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def _render_fragments(self, charts: List[Tuple[str, str, Tuple[str, ...]]], inputs: Dict[str, "pd.DataFrame"],
+                          keys: Dict[str, str]) -> Dict[str, str]:
+        """HTML fragment per chart, from the fragment cache or rendered in a worker pool"""
+        fragment_dir = settings.CHARTS_DIR / "fragments"
+        fragment_dir.mkdir(exist_ok=True)
+        fragments, pending = {}, []
+        for name, method, _ in charts:
+            fragment_path = fragment_dir / f"{name}_{keys[name]}.html"
+            if fragment_path.exists():
+                fragments[name] = fragment_path.read_text(encoding='utf-8')
+            else:
+                pending.append((name, method, fragment_path))
+        if not pending:
+            return fragments
+        
+        # Plotly serialization is CPU-bound, so charts render in separate processes
+        workers = min(settings.CHART_RENDER_WORKERS, len(pending)) if len(pending) > 1 else 0
+        logger.info(f"Rendering {len(pending)} charts ({len(fragments)} cached) on {max(workers, 1)} workers")
+        with make_executor(workers) as executor:
+            futures = [
+                (name, fragment_path, executor.submit(_render_chart, method, inputs[name], name))
+                for name, method, fragment_path in pending
+            ]
+            for name, fragment_path, future in futures:
+                fragments[name] = future.result()
+                _write_atomic(fragment_path, fragments[name])
+        return fragments
+    
+    def _create_volume_chart(self, df: "pd.DataFrame"):
+        """Create trading volume chart from per-company share totals"""
+        companies, shares = top_n_with_other(list(df['company']), df['shares'].values, settings.CHART_TOP_N)
         
         fig = go.Figure(data=[
             go.Bar(
-                x=volume_by_company.values,
-                y=volume_by_company.index,
+                x=shares,
+                y=companies,
                 orientation='h',
                 marker_color='skyblue'
             )
@@ -76,31 +209,44 @@ class ChartGenerationTool(BaseTool):
             title='Insider Trading Volume by Company (Last 24 Hours)',
             xaxis_title='Number of Shares',
             yaxis_title='Company',
+            yaxis_autorange='reversed',
             height=600
         )
         
         return fig
     
-    def _create_value_distribution_chart(self, df: pd.DataFrame):
-        """Create transaction value distribution chart"""
-        fig = px.histogram(
-            df, 
-            x='value', 
-            nbins=20,
+    def _company_volume(self, df: "pd.DataFrame") -> "pd.DataFrame":
+        """Per-company share totals of these trades, largest first.
+
+        Computed once in the parent: it is both the volume chart's cache key
+        input and the data the worker draws.
+        """
+        volume = df['shares'].groupby(df['company'].fillna('Unknown')).sum().sort_values(ascending=False)
+        return volume.rename_axis('company').reset_index(name='shares')
+    
+    def _create_value_distribution_chart(self, df: "pd.DataFrame"):
+        """Create transaction value distribution chart on log-spaced value bins"""
+        labels, counts = log_value_bins(df['value'].to_numpy(dtype=float, na_value=0), settings.CHART_VALUE_BINS_PER_DECADE)
+        
+        fig = go.Figure(data=[go.Bar(x=labels, y=counts)])
+        fig.update_layout(
             title='Distribution of Transaction Values (Last 24 Hours)',
-            labels={'value': 'Transaction Value ($)', 'count': 'Number of Transactions'}
+            xaxis_title='Transaction Value ($)',
+            yaxis_title='Number of Transactions',
+            bargap=0.05
         )
         
         return fig
     
-    def _create_transaction_type_chart(self, df: pd.DataFrame):
+    def _create_transaction_type_chart(self, df: "pd.DataFrame"):
         """Create transaction type pie chart"""
         type_counts = df['transaction_type'].value_counts()
+        types, counts = top_n_with_other(list(type_counts.index), type_counts.values, settings.CHART_TOP_N)
         
         fig = go.Figure(data=[
             go.Pie(
-                labels=type_counts.index,
-                values=type_counts.values,
+                labels=types,
+                values=counts,
                 hole=0.3
             )
         ])
@@ -109,4 +255,62 @@ class ChartGenerationTool(BaseTool):
             title='Transaction Types Distribution (Last 24 Hours)'
         )
         
+        return fig
+    
+    def _create_activity_timeline_chart(self, df: "pd.DataFrame"):
+        """Create daily transaction value chart, downsampled with LTTB for long date ranges"""
+        dates = pd.to_datetime(df['transaction_date'], errors='coerce')
+        daily = df['value'].fillna(0).groupby(dates).sum().sort_index()
+        
+        days = daily.index.to_numpy(dtype='datetime64[D]').astype(float)
+        x, y = lttb(days, daily.to_numpy(dtype=float), settings.CHART_MAX_POINTS)
+        
+        fig = go.Figure(data=[
+            go.Scatter(x=pd.to_datetime(x, unit='D'), y=y, mode='lines+markers', line_color='steelblue')
+        ])
+        fig.update_layout(
+            title='Daily Transaction Value',
+            xaxis_title='Transaction Date',
+            yaxis_title='Transaction Value ($)'
+        )
+        
+        return fig
+    
+    def _create_baseline_zscore_chart(self, df: "pd.DataFrame"):
+        """Create buy vs sell z-score scatter of today's activity against the trailing baseline"""
+        magnitude = df[['buy_zscore', 'sell_zscore']].abs().max(axis=1)
+        df = df.loc[magnitude.nlargest(settings.CHART_MAX_POINTS).index]
+        today_value = df['today_buy_value'] + df['today_sell_value']
+        hover = (
+            df['key'] + " (" + df['company_name'].fillna('') + ")<br>"
+            + "Buys $" + df['today_buy_value'].map('{:,.0f}'.format)
+            + " vs $" + df['baseline_buy_value'].map('{:,.0f}'.format) + "/day<br>"
+            + "Sales $" + df['today_sell_value'].map('{:,.0f}'.format)
+            + " vs $" + df['baseline_sell_value'].map('{:,.0f}'.format) + "/day"
+        )
+        
+        fig = go.Figure(data=[
+            go.Scattergl(
+                x=df['buy_zscore'],
+                y=df['sell_zscore'],
+                mode='markers',
+                text=hover,
+                hoverinfo='text',
+                marker=dict(
+                    size=6 + 24 * (today_value / today_value.max()) ** 0.5,
+                    color=df['buy_zscore'] - df['sell_zscore'],
+                    colorscale='RdYlGn',
+                    cmid=0,
+                    colorbar=dict(title='Buy - Sell z')
+                )
+            )
+        ])
+        baseline_days = int(df['baseline_days'].iloc[0]) if len(df) else settings.ROLLUP_BASELINE_DAYS
+        fig.update_layout(
+            title=f"Today's Activity vs {baseline_days}-Day Baseline by Ticker (z-scores)",
+            xaxis_title='Buy value z-score',
+            yaxis_title='Sell value z-score',
+            height=600
+        )
+        
         return fig
\ No newline at end of file
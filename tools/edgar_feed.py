@@ -0,0 +1,98 @@
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+from utils.logger import setup_logger
+from config.settings import settings
+from tools.sec_fetcher import EdgarFetcher, get_fetcher
+
+logger = setup_logger(__name__)
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+ACCESSION_PATTERN = re.compile(r'accession-number=(\d{10}-\d{2}-\d{6})')
+TITLE_PATTERN = re.compile(r'^(?P<form>\S+) - (?P<name>.*?) \((?P<cik>\d+)\) \((?P<role>[^)]*)\)')
+
+
+def current_feed_url(form: str, start: int = 0, count: Optional[int] = None) -> str:
+    """URL of one page of EDGAR's latest-filings Atom feed, newest first"""
+    count = count or settings.DAEMON_FEED_PAGE_SIZE
+    return (
+        f"{settings.SEC_BASE_URL}/cgi-bin/browse-edgar?action=getcurrent&type={form}"
+        f"&company=&dateb=&owner=include&start={start}&count={count}&output=atom"
+    )
+
+
+def parse_current_feed(body: bytes, forms: Optional[Set[str]] = None) -> List[Dict]:
+    """Parse a latest-filings feed page into filings, one per accession number.
+
+    Insider forms appear once for the issuer and once per reporting owner;
+    the issuer entry provides the company name and CIK when present.
+    """
+    filings: Dict[str, Dict] = {}
+    root = ET.fromstring(body)
+    for entry in root.iter(f'{ATOM}entry'):
+        accession = ACCESSION_PATTERN.search(entry.findtext(f'{ATOM}id', ''))
+        title = TITLE_PATTERN.match(entry.findtext(f'{ATOM}title', '').strip())
+        link = entry.find(f'{ATOM}link')
+        category = entry.find(f'{ATOM}category')
+        if not (accession and title and link is not None):
+            continue
+
+        form = category.get('term') if category is not None else title.group('form')
+        if forms is not None and form not in forms:
+            continue
+
+        accession_number = accession.group(1)
+        accepted = entry.findtext(f'{ATOM}updated', '').strip()
+        filing = filings.get(accession_number)
+        if filing is None or title.group('role') == 'Issuer':
+            filings[accession_number] = {
+                'cik': int(title.group('cik')),
+                'company': title.group('name').strip(),
+                'form': form,
+                'filing_date': accepted[:10],
+                'accepted': accepted,
+                'accession_number': accession_number,
+                'url': f"{link.get('href').rsplit('/', 1)[0]}/{accession_number}.txt",
+            }
+    return list(filings.values())
+
+
+def iter_new_filings(
+    forms: Set[str],
+    since: Optional[datetime],
+    seen: Optional[Set[str]] = None,
+    fetcher: Optional[EdgarFetcher] = None,
+    max_pages: Optional[int] = None,
+) -> Iterator[Dict]:
+    """Yield feed filings accepted at or after `since`, newest first, skipping accessions in `seen`.
+
+    Pages are requested only until the feed reaches filings older than
+    `since`, so an idle poll costs one request per form type.
+    """
+    fetcher = fetcher or get_fetcher()
+    max_pages = max_pages or settings.DAEMON_MAX_FEED_PAGES
+    seen = set(seen or ())
+    # The feed filters by form prefix, so request each base form once
+    for form in sorted({form.split('/')[0] for form in forms}):
+        for page in range(max_pages):
+            url = current_feed_url(form, start=page * settings.DAEMON_FEED_PAGE_SIZE)
+            response = fetcher.get(url)
+            if not response.ok:
+                logger.warning(f"Could not fetch latest filings feed (status {response.status})")
+                break
+
+            entries = parse_current_feed(response.body)
+            reached_mark = False
+            for filing in entries:
+                if since is not None and datetime.fromisoformat(filing['accepted']) < since:
+                    reached_mark = True
+                    continue
+                if filing['form'] in forms and filing['accession_number'] not in seen:
+                    seen.add(filing['accession_number'])
+                    yield filing
+            if reached_mark or not entries:
+                break
+        else:
+            logger.warning(f"Feed for form {form} still had new filings after {max_pages} pages")
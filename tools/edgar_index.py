@@ -0,0 +1,202 @@
+import gzip
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from utils.logger import setup_logger
+from config.settings import settings
+from tools.edgar_feed import iter_new_filings
+from tools.sec_fetcher import EdgarFetcher, get_fetcher
+
+logger = setup_logger(__name__)
+
+INSIDER_FORMS = {'3', '3/A', '4', '4/A', '5', '5/A'}
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# EDGAR answers these for days without an index (weekends, holidays, not yet published)
+MISSING_INDEX_STATUSES = {403, 404}
+# 403 is also how EDGAR blocks or throttles a client, so strict callers only trust a 404
+STRICT_MISSING_INDEX_STATUSES = {404}
+
+
+def _quarter(day: date) -> int:
+    return (day.month - 1) // 3 + 1
+
+
+def _quarter_bounds(year: int, quarter: int) -> Tuple[date, date]:
+    start = date(year, 3 * quarter - 2, 1)
+    end = date(year + 1, 1, 1) if quarter == 4 else date(year, 3 * quarter + 1, 1)
+    return start, end - timedelta(days=1)
+
+
+def daily_index_url(day: date) -> str:
+    """URL of the daily master index for a given day"""
+    return (
+        f"{settings.SEC_BASE_URL}/Archives/edgar/daily-index/"
+        f"{day.year}/QTR{_quarter(day)}/master.{day:%Y%m%d}.idx"
+    )
+
+
+def quarterly_index_url(year: int, quarter: int) -> str:
+    """URL of the gzip-compressed full master index for a quarter"""
+    return f"{settings.SEC_BASE_URL}/Archives/edgar/full-index/{year}/QTR{quarter}/master.gz"
+
+
+def _parse_date(value: str) -> Optional[str]:
+    """Normalize index dates (YYYYMMDD in daily files, YYYY-MM-DD in full-index) to YYYY-MM-DD"""
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    if len(value) == 10:
+        return value
+    return None
+
+
+def iter_master_index(
+    path: Path,
+    forms: Optional[Set[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Iterator[Dict]:
+    """Stream-parse a master.idx file (plain or gzip), yielding matching filings.
+
+    The file is read line by line so even multi-hundred-megabyte quarterly
+    indexes are processed in constant memory.
+    """
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    opener = gzip.open if compressed else open
+    start = start_date.isoformat() if start_date else None
+    end = end_date.isoformat() if end_date else None
+
+    with opener(path, 'rt', encoding='latin-1') as f:
+        # Skip the free-text header, which ends with a line of dashes
+        for line in f:
+            if line.startswith('---'):
+                break
+
+        for line in f:
+            parts = line.rstrip('\n').split('|')
+            if len(parts) != 5:
+                continue
+            cik, company, form, filed, filename = parts
+            if forms is not None and form not in forms:
+                continue
+            filing_date = _parse_date(filed)
+            if filing_date is None:
+                continue
+            if (start and filing_date < start) or (end and filing_date > end):
+                continue
+
+            yield {
+                'cik': int(cik),
+                'company': company.strip(),
+                'form': form,
+                'filing_date': filing_date,
+                'accession_number': Path(filename).stem,
+                'url': f"{settings.SEC_BASE_URL}/Archives/{filename.strip()}",
+            }
+
+
+def plan_index_downloads(start_date: date, end_date: date) -> List[str]:
+    """Choose the cheapest set of index files covering [start_date, end_date].
+
+    Quarters where the window spans more than SEC_INDEX_DAILY_MAX_DAYS days
+    use the single quarterly full-index; shorter spans use daily indexes.
+    """
+    urls = []
+    day = start_date
+    while day <= end_date:
+        year, quarter = day.year, _quarter(day)
+        _, quarter_end = _quarter_bounds(year, quarter)
+        span_end = min(end_date, quarter_end)
+
+        if (span_end - day).days + 1 > settings.SEC_INDEX_DAILY_MAX_DAYS:
+            urls.append(quarterly_index_url(year, quarter))
+        else:
+            current = day
+            while current <= span_end:
+                if current.weekday() < 5:  # EDGAR does not publish weekend indexes
+                    urls.append(daily_index_url(current))
+                current += timedelta(days=1)
+
+        day = span_end + timedelta(days=1)
+    return urls
+
+
+def plan_backfill_shards(start_date: date, end_date: date, granularity: str = "day") -> List[Tuple[date, date]]:
+    """Split [start_date, end_date] into independent (start, end) shards.
+
+    "day" gives one shard per weekday (one daily index each); "quarter"
+    gives one shard per calendar quarter, clipped to the range.
+    """
+    if granularity not in ("day", "quarter"):
+        raise ValueError(f"Unknown shard granularity: {granularity}")
+    shards = []
+    day = start_date
+    while day <= end_date:
+        if granularity == "day":
+            if day.weekday() < 5:
+                shards.append((day, day))
+            day += timedelta(days=1)
+        else:
+            _, quarter_end = _quarter_bounds(day.year, _quarter(day))
+            shard_end = min(end_date, quarter_end)
+            shards.append((day, shard_end))
+            day = shard_end + timedelta(days=1)
+    return shards
+
+
+def iter_index_filings(
+    start_date: date,
+    end_date: date,
+    forms: Optional[Set[str]] = INSIDER_FORMS,
+    fetcher: Optional[EdgarFetcher] = None,
+    strict: bool = False,
+) -> Iterator[Dict]:
+    """Yield filings of the given form types filed between start_date and end_date.
+
+    A missing index is skipped quietly. Any other failed download is
+    skipped with a warning, or raises with `strict`. In strict mode only
+    a 404 counts as missing, so a blocked or throttled request raises.
+    """
+    fetcher = fetcher or get_fetcher()
+    missing = STRICT_MISSING_INDEX_STATUSES if strict else MISSING_INDEX_STATUSES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, url in enumerate(plan_index_downloads(start_date, end_date)):
+            dest = Path(tmp_dir) / f"index_{i}"
+            response = fetcher.download_sync(url, dest)
+            if strict and not response.ok and response.status not in missing:
+                raise RuntimeError(f"Could not download {url} (status {response.status}: {response.error})")
+            if not response.ok:
+                if response.status in missing:
+                    # Holidays and not-yet-published days have no daily index
+                    logger.debug(f"No index at {url} (status {response.status})")
+                else:
+                    logger.warning(f"Skipping index {url} after failed download "
+                                   f"(status {response.status}: {response.error}); its filings are missing")
+                continue
+            yield from iter_master_index(dest, forms, start_date, end_date)
+            dest.unlink()
+
+
+def iter_recent_filings(hours_back: int = 24, forms: Optional[Set[str]] = INSIDER_FORMS) -> Iterator[Dict]:
+    """Yield filings from the last `hours_back` hours.
+
+    EDGAR publishes a daily index only after the day closes, so past days
+    come from the indexes and the current day from the latest-filings feed
+    (which needs explicit form types; with `forms=None` today is skipped).
+    """
+    end_date = datetime.now().date()
+    start_date = (datetime.now() - timedelta(hours=hours_back)).date()
+    seen = set()
+    for filing in iter_index_filings(start_date, end_date, forms):
+        seen.add(filing['accession_number'])
+        yield filing
+
+    if forms is None:
+        logger.debug("No form types given, so filings from today are not read from the feed")
+        return
+    since = datetime.combine(end_date, time.min).astimezone()
+    yield from iter_new_filings(forms, since, seen)
@@ -0,0 +1,172 @@
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+FORM4_TYPES = {'4', '4/A'}
+
+# SEC Form 4 transaction codes (General Instructions, item 8)
+TRANSACTION_CODES = {
+    'P': 'Purchase',
+    'S': 'Sale',
+    'A': 'Grant',
+    'D': 'Disposition to Issuer',
+    'F': 'Tax Withholding',
+    'I': 'Discretionary',
+    'M': 'Option Exercise',
+    'C': 'Conversion',
+    'E': 'Expiration of Short Derivative',
+    'H': 'Expiration of Long Derivative',
+    'O': 'Out-of-the-Money Exercise',
+    'X': 'Option Exercise',
+    'G': 'Gift',
+    'L': 'Small Acquisition',
+    'W': 'Inheritance',
+    'Z': 'Voting Trust',
+    'J': 'Other',
+    'K': 'Equity Swap',
+    'U': 'Tender of Shares',
+    'V': 'Voluntary Report',
+}
+
+_TRANSACTION_TAGS = {'nonDerivativeTransaction', 'derivativeTransaction'}
+_CLEARED_TAGS = _TRANSACTION_TAGS | {
+    'nonDerivativeHolding', 'derivativeHolding', 'footnotes', 'reportingOwner', 'issuer',
+}
+
+Source = Union[bytes, str, Path, BinaryIO]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(elem: ET.Element, path: str) -> Optional[str]:
+    value = elem.findtext(path)
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def _number(elem: ET.Element, path: str) -> Optional[float]:
+    value = _text(elem, path)
+    if value is None:
+        return None
+    try:
+        return float(value.replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _is_set(elem: ET.Element, path: str) -> bool:
+    return _text(elem, path) in ('1', 'true', 'True')
+
+
+def _owner_title(relationship: Optional[ET.Element]) -> str:
+    """Describe a reporting owner's relationship to the issuer"""
+    if relationship is None:
+        return 'N/A'
+    roles = []
+    if _is_set(relationship, 'isOfficer'):
+        roles.append(_text(relationship, 'officerTitle') or 'Officer')
+    if _is_set(relationship, 'isDirector'):
+        roles.append('Director')
+    if _is_set(relationship, 'isTenPercentOwner'):
+        roles.append('10% Owner')
+    if _is_set(relationship, 'isOther'):
+        roles.append(_text(relationship, 'otherText') or 'Other')
+    return ', '.join(roles) or 'N/A'
+
+
+def _open_source(source: Source) -> BinaryIO:
+    """Return a binary stream positioned at the ownership XML.
+
+    Full EDGAR submissions (.txt) wrap the XML in SGML; for those only the
+    <ownershipDocument> element is handed to the parser.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix.lower() == '.xml':
+            return open(path, 'rb')
+        source = path.read_bytes()
+    if isinstance(source, bytes):
+        start = source.find(b'<ownershipDocument')
+        end = source.rfind(b'</ownershipDocument>')
+        if start != -1 and end != -1:
+            source = source[start:end + len(b'</ownershipDocument>')]
+        return io.BytesIO(source)
+    return source
+
+
+def iter_form4_trades(source: Source, accession_number: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Incrementally parse a Form 4/4A ownership document into normalized trades.
+
+    One dict is yielded per non-derivative and derivative transaction row.
+    Elements are cleared as soon as they have been consumed so memory use
+    stays flat regardless of document size.
+    """
+    stream = _open_source(source)
+    issuer: Dict[str, Any] = {}
+    owner: Dict[str, Any] = {}
+    form_type = None
+    line_number = 0
+
+    try:
+        for _, elem in ET.iterparse(stream, events=('end',)):
+            tag = _local(elem.tag)
+
+            if tag == 'documentType':
+                form_type = (elem.text or '').strip() or None
+            elif tag == 'issuer':
+                issuer = {
+                    'cik': _text(elem, 'issuerCik'),
+                    'company': _text(elem, 'issuerName') or 'Unknown',
+                    'ticker': (_text(elem, 'issuerTradingSymbol') or '').upper() or None,
+                }
+            elif tag == 'reportingOwner' and not owner:
+                # Filings by groups list several owners; the first one is the primary filer
+                owner = {
+                    'insider_cik': _text(elem, 'reportingOwnerId/rptOwnerCik'),
+                    'insider_name': _text(elem, 'reportingOwnerId/rptOwnerName') or 'Unknown',
+                    'title': _owner_title(elem.find('reportingOwnerRelationship')),
+                }
+            elif tag in _TRANSACTION_TAGS:
+                line_number += 1
+                code = _text(elem, 'transactionCoding/transactionCode')
+                shares = _number(elem, 'transactionAmounts/transactionShares/value')
+                price = _number(elem, 'transactionAmounts/transactionPricePerShare/value')
+                yield {
+                    'company': issuer.get('company', 'Unknown'),
+                    'ticker': issuer.get('ticker'),
+                    'cik': issuer.get('cik'),
+                    'insider_name': owner.get('insider_name', 'Unknown'),
+                    'insider_cik': owner.get('insider_cik'),
+                    'title': owner.get('title', 'N/A'),
+                    'transaction_date': (_text(elem, 'transactionDate/value') or '')[:10] or None,
+                    'transaction_type': TRANSACTION_CODES.get(code, code or 'Unknown'),
+                    'transaction_code': code,
+                    'acquired_disposed': _text(elem, 'transactionAmounts/transactionAcquiredDisposedCode/value'),
+                    'security_title': _text(elem, 'securityTitle/value'),
+                    'is_derivative': tag == 'derivativeTransaction',
+                    'shares': shares or 0,
+                    'price': price or 0,
+                    'value': (shares or 0) * (price or 0),
+                    'shares_owned_after': _number(
+                        elem, 'postTransactionAmounts/sharesOwnedFollowingTransaction/value'
+                    ),
+                    'form_type': form_type,
+                    'accession_number': accession_number,
+                    'line_number': line_number,
+                }
+
+            if tag in _CLEARED_TAGS:
+                elem.clear()
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def parse_form4(source: Source, accession_number: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Parse a Form 4/4A document into a list of normalized trades"""
+    return list(iter_form4_trades(source, accession_number))
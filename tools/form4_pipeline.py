@@ -0,0 +1,155 @@
+import asyncio
+import queue
+import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from utils.executors import make_executor
+from utils.logger import setup_logger
+from config.settings import settings
+from tools.form4_parser import iter_form4_trades
+from tools.sec_fetcher import EdgarFetcher, get_fetcher
+
+logger = setup_logger(__name__)
+
+# (document body, accession number, filing date)
+Document = Tuple[bytes, Optional[str], Optional[str]]
+
+
+def _parse_batch(batch: List[Document]) -> Tuple[List[Dict[str, Any]], List[Tuple[Optional[str], str]]]:
+    """Worker entry point: parse a chunk of documents, returning trades and (accession, error) failures.
+
+    A document that fails to parse contributes no trades; the rest of the
+    chunk is unaffected. Errors are returned rather than logged, since the
+    worker process does not share the parent's log handlers.
+    """
+    trades, failed = [], []
+    for body, accession_number, filing_date in batch:
+        try:
+            parsed = list(iter_form4_trades(body, accession_number))
+        except ET.ParseError as e:
+            failed.append((accession_number, f"malformed XML: {e}"))
+            continue
+        except Exception as e:
+            failed.append((accession_number, f"{type(e).__name__}: {e}"))
+            continue
+        for trade in parsed:
+            trade['filing_date'] = filing_date
+        trades.extend(parsed)
+    return trades, failed
+
+
+def _batch_trades(future: Future, failed: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    trades, errors = future.result()
+    for accession_number, error in errors:
+        logger.warning(f"Error parsing Form 4 {accession_number}: {error}")
+        if failed is not None:
+            failed.add(accession_number)
+    return trades
+
+
+def parse_documents(
+    documents: Iterable[Document],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    failed: Optional[Set[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Parse already-fetched Form 4 documents in a process pool.
+
+    Documents are sent to workers in chunks and trades are yielded as each
+    chunk finishes. At most two chunks per worker are in flight, so memory
+    stays bounded for arbitrarily long document streams. Accession numbers
+    of documents that could not be parsed are added to `failed` if given.
+    """
+    workers = settings.FORM4_PARSE_WORKERS if workers is None else workers
+    chunk_size = chunk_size or settings.FORM4_PARSE_CHUNK_SIZE
+    max_in_flight = 2 * max(workers, 1)
+    finished: queue.Queue = queue.Queue()
+    in_flight = 0
+
+    documents = iter(documents)
+    with make_executor(workers) as executor:
+        while True:
+            batch = list(islice(documents, chunk_size))
+            if not batch:
+                break
+            executor.submit(_parse_batch, batch).add_done_callback(finished.put)
+            in_flight += 1
+            while in_flight >= max_in_flight:
+                yield from _batch_trades(finished.get(), failed)
+                in_flight -= 1
+
+        while in_flight:
+            yield from _batch_trades(finished.get(), failed)
+            in_flight -= 1
+
+
+async def _fetch_batches(
+    fetcher: EdgarFetcher,
+    filings: List[Dict[str, Any]],
+    chunk_size: int,
+    executor: Executor,
+    finished: queue.Queue,
+    failed: Optional[Set[str]] = None,
+) -> int:
+    """Fetch filings concurrently, handing each full chunk to the executor as it fills"""
+
+    async def fetch_one(filing: Dict[str, Any]):
+        return filing, await fetcher.fetch(filing['url'])
+
+    submitted = 0
+    batch: List[Document] = []
+    for next_done in asyncio.as_completed([fetch_one(filing) for filing in filings]):
+        filing, response = await next_done
+        if not response.ok:
+            logger.warning(f"Could not fetch Form 4 {filing['accession_number']} (status {response.status})")
+            if failed is not None:
+                failed.add(filing['accession_number'])
+            continue
+        batch.append((response.body, filing['accession_number'], filing['filing_date']))
+        if len(batch) >= chunk_size:
+            executor.submit(_parse_batch, batch).add_done_callback(finished.put)
+            submitted += 1
+            batch = []
+
+    if batch:
+        executor.submit(_parse_batch, batch).add_done_callback(finished.put)
+        submitted += 1
+    return submitted
+
+
+def fetch_and_parse(
+    filings: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    fetcher: Optional[EdgarFetcher] = None,
+    executor: Optional[Executor] = None,
+    failed: Optional[Set[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Fetch Form 4 filings and parse them in a process pool at the same time.
+
+    Downloads keep running on the fetcher's event loop while earlier chunks
+    are parsed, and trades are yielded as soon as their chunk completes.
+    Long-running callers can pass their own `executor` to keep the worker
+    processes warm between calls; it is not shut down here. Filings that
+    could not be fetched or parsed are logged and, when a `failed` set is
+    given, their accession numbers are added to it so callers can retry them.
+    """
+    workers = settings.FORM4_PARSE_WORKERS if workers is None else workers
+    chunk_size = chunk_size or settings.FORM4_PARSE_CHUNK_SIZE
+    fetcher = fetcher or get_fetcher()
+    finished: queue.Queue = queue.Queue()
+
+    with (nullcontext(executor) if executor is not None else make_executor(workers)) as executor:
+        producer = fetcher.submit(_fetch_batches(fetcher, list(filings), chunk_size, executor, finished, failed))
+        producer.add_done_callback(finished.put)
+
+        completed, total = 0, None
+        while total is None or completed < total:
+            future = finished.get()
+            if future is producer:
+                total = producer.result()
+                continue
+            completed += 1
+            yield from _batch_trades(future, failed)
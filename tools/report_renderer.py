@@ -0,0 +1,288 @@
+import html
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from config.settings import settings
+
+# Row templates are plain format strings, bound once to module-level render functions
+
+HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Insider Trading Analysis Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; }}
+        .header {{ background-color: #2c3e50; color: white; padding: 20px; text-align: center; }}
+        .summary {{ background-color: #ecf0f1; padding: 20px; margin: 20px 0; }}
+        .section {{ margin: 20px 0; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+        .metric {{ display: inline-block; margin: 10px; padding: 10px; background-color: #3498db; color: white; border-radius: 5px; }}
+        .pager {{ margin: 10px 0; }}
+        .pager button {{ padding: 4px 12px; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>CrowdWisdomTrading - Insider Trading Analysis</h1>
+        <p>Report Generated: {timestamp}</p>
+    </div>
+
+    <div class="summary">
+        <h2>Executive Summary</h2>
+        <div class="metric">Total Trades: {total_trades:,}</div>
+        <div class="metric">Total Value: ${total_value:,.0f}</div>
+        <div class="metric">Total Shares: {total_shares:,.0f}</div>
+    </div>
+"""
+
+TABLE_START = """
+    <div class="section">
+        <h2>{heading}</h2>
+        {intro}
+        <table{attributes}>
+            <thead><tr>{header}</tr></thead>
+"""
+
+TABLE_END = """        </table>
+    </div>
+"""
+
+PAGER = """        <div class="pager" data-table="{table_id}">
+            <button type="button" class="prev">Previous</button>
+            <span class="page-label">{pages} pages of {page_size} transactions</span>
+            <button type="button" class="next">Next</button>
+        </div>
+"""
+
+ACTIVE_ROW = "<tr><td>{0}</td><td>${1:,.0f}</td></tr>\n"
+
+BASELINE_ROW = "<tr><td>{0}</td><td>{1}</td><td>${2:,.0f}</td><td>${3:,.0f}</td><td>{4}</td></tr>\n"
+
+TRADE_ROW = "<tr><td>{0}</td><td>{1}</td><td>{2}</td><td>{3}</td><td>{4:,.0f}</td><td>${5:.2f}</td><td>${6:,.0f}</td></tr>\n"
+
+FILING_ROW = "<tr><td>{0}</td><td>{1}</td><td>{2}</td></tr>\n"
+
+INSIGHTS = """
+    <div class="section">
+        <h2>Analysis & Insights</h2>
+        <ul>
+            <li><strong>Market Activity:</strong> Detected {total_trades:,} insider transactions in the last 24 hours</li>
+            <li><strong>Transaction Volume:</strong> Total value of ${total_value:,.0f} across all transactions</li>
+            <li><strong>Most Active:</strong> {most_active}</li>
+        </ul>
+    </div>
+"""
+
+NARRATIVE = """
+    <div class="section">
+        <h2>Analyst Commentary</h2>
+        <p>{0}</p>
+    </div>
+"""
+
+FOOT = """
+    <div class="section">
+        <h2>Charts and Visualizations</h2>
+        <p>Interactive charts have been generated and saved separately for detailed analysis.</p>
+        <p>Chart files: {chart_paths}</p>
+    </div>
+
+    <footer style="text-align: center; margin-top: 40px; color: #7f8c8d;">
+        <p>Generated by CrowdWisdomTrading AI Agent System</p>
+    </footer>
+    <script>
+    // Only one page of each paginated table is shown, so the browser lays out a page at a time
+    document.querySelectorAll('.pager').forEach(function (pager) {{
+        var pages = document.getElementById(pager.dataset.table).tBodies;
+        var label = pager.querySelector('.page-label');
+        var current = 0;
+        if (!pages.length) return;
+        function show(page) {{
+            pages[current].hidden = true;
+            current = Math.max(0, Math.min(page, pages.length - 1));
+            pages[current].hidden = false;
+            label.textContent = 'Page ' + (current + 1) + ' of ' + pages.length;
+        }}
+        pager.querySelector('.prev').onclick = function () {{ show(current - 1); }};
+        pager.querySelector('.next').onclick = function () {{ show(current + 1); }};
+        show(0);
+    }});
+    </script>
+</body>
+</html>
+"""
+
+render_active_row = ACTIVE_ROW.format
+render_baseline_row = BASELINE_ROW.format
+render_trade_row = TRADE_ROW.format
+render_filing_row = FILING_ROW.format
+
+
+class _EscapeCache(dict):
+    """Escaped text per raw value; names repeat across many rows, so each is escaped once"""
+
+    def __missing__(self, value) -> str:
+        text = self[value] = html.escape(str(value)) if value else 'N/A'
+        return text
+
+
+def _header(*columns: str) -> str:
+    return "".join(f"<th>{column}</th>" for column in columns)
+
+
+class _ReportTotals:
+    """Summary totals accumulated while trades stream past"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_value = self.total_shares = 0.0
+        self.company_value = Counter()
+
+    def tally(self, insider_trades: Iterable[Dict]) -> Iterator[Dict]:
+        for trade in insider_trades:
+            value = trade.get('value') or 0
+            self.count += 1
+            self.total_value += value
+            self.total_shares += trade.get('shares') or 0
+            self.company_value[trade.get('company') or 'Unknown'] += value
+            yield trade
+
+    def summary(self) -> Tuple[int, float, float, List[Tuple[str, float]]]:
+        return self.count, self.total_value, self.total_shares, self.company_value.most_common(5)
+
+
+def summarize_for_report(insider_trades: Iterable[Dict]) -> Tuple[int, float, float, List[Tuple[str, float]]]:
+    """Trade count, total value, total shares and the five companies with the most value, in one pass"""
+    totals = _ReportTotals()
+    for _ in totals.tally(insider_trades):
+        pass
+    return totals.summary()
+
+
+def iter_trade_pages(insider_trades: Iterable[Dict], page_size: int) -> Iterator[str]:
+    """Yield the transaction table one <tbody> page at a time; all but the first start hidden"""
+    escaped = _EscapeCache()
+    trades = iter(insider_trades)
+    hidden = ""
+    while True:
+        page = list(islice(trades, page_size))
+        if not page:
+            break
+        rows = [
+            render_trade_row(
+                escaped[trade.get('company')],
+                escaped[trade.get('insider_name')],
+                escaped[trade.get('title')],
+                escaped[trade.get('transaction_type')],
+                trade.get('shares') or 0,
+                trade.get('price') or 0,
+                trade.get('value') or 0,
+            )
+            for trade in page
+        ]
+        yield f"<tbody{hidden}>\n{''.join(rows)}</tbody>\n"
+        hidden = " hidden"
+
+
+def iter_report_html(
+    sec_filings: Sequence[Dict],
+    insider_trades: Iterable[Dict],
+    chart_paths: str = "",
+    narrative: Optional[str] = None,
+    baseline: Sequence[Dict] = (),
+    page_size: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield the report in chunks, section by section, so it can be written as it is rendered.
+
+    The summary totals at the top need every trade before the table, so a
+    sequence is read twice and its table pages stream straight to the
+    output. A one-shot iterator is read once: the table pages are rendered
+    while the totals are counted and only the rendered HTML is held until
+    the header is written. The most active companies come from these
+    trades; `baseline` rows come from the rollups.
+    """
+    page_size = page_size or settings.REPORT_PAGE_SIZE
+    escape = html.escape
+    if iter(insider_trades) is insider_trades:
+        totals = _ReportTotals()
+        trade_pages: Iterable[str] = list(iter_trade_pages(totals.tally(insider_trades), page_size))
+        total_trades, total_value, total_shares, most_active = totals.summary()
+    else:
+        total_trades, total_value, total_shares, most_active = summarize_for_report(insider_trades)
+        trade_pages = iter_trade_pages(insider_trades, page_size)
+
+    yield HEAD.format(
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        total_trades=total_trades,
+        total_value=total_value,
+        total_shares=total_shares,
+    )
+
+    yield TABLE_START.format(
+        heading="Most Active Companies (Last 24 Hours)", intro="", attributes="",
+        header=_header("Company", "Total Transaction Value"),
+    )
+    yield "".join(render_active_row(escape(str(company)), value) for company, value in most_active)
+    yield TABLE_END
+
+    yield TABLE_START.format(
+        heading=f"Today vs {settings.ROLLUP_BASELINE_DAYS}-Day Baseline", intro="", attributes="",
+        header=_header("Ticker", "Company", "Today's Value", "Baseline Daily Value", "Ratio"),
+    )
+    yield "".join(
+        render_baseline_row(
+            escape(str(row['key'])),
+            escape(str(row['company_name'] or '')),
+            row['today_value'],
+            row['baseline_value'],
+            f"{row['ratio_to_baseline']:.1f}x" if row['ratio_to_baseline'] else "New activity",
+        )
+        for row in baseline
+    )
+    yield TABLE_END
+
+    pages = -(-total_trades // page_size)
+    yield TABLE_START.format(
+        heading="Recent Insider Transactions",
+        intro=PAGER.format(table_id="transactions", pages=pages, page_size=page_size) if pages > 1 else "",
+        attributes=' id="transactions"',
+        header=_header("Company", "Insider", "Title", "Type", "Shares", "Price", "Value"),
+    )
+    yield from trade_pages
+    yield TABLE_END
+
+    yield TABLE_START.format(
+        heading="SEC Filings Activity",
+        intro=f"<p>Total SEC filings in last 24 hours: {len(sec_filings):,}</p>",
+        attributes="",
+        header=_header("Company", "Form Type", "Filing Date"),
+    )
+    yield "".join(
+        render_filing_row(
+            escape(str(filing.get('company', 'N/A'))),
+            escape(str(filing.get('form', 'N/A'))),
+            escape(str(filing.get('filing_date', 'N/A'))),
+        )
+        for filing in islice(sec_filings, 10)  # Show first 10
+    )
+    yield TABLE_END
+
+    yield INSIGHTS.format(
+        total_trades=total_trades,
+        total_value=total_value,
+        most_active=escape(str(most_active[0][0])) if most_active else "No activity detected",
+    )
+    if narrative:
+        yield NARRATIVE.format(escape(narrative).replace('\n', '<br>'))
+    yield FOOT.format(chart_paths=escape(chart_paths))
+
+
+def write_report(path: Path, chunks: Iterable[str]) -> Path:
+    """Stream rendered chunks to `path`; the document is never held in memory as a whole"""
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        f.writelines(chunks)
+    return path
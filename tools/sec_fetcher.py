@@ -0,0 +1,245 @@
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+
+from data.http_cache import HTTPCache, get_http_cache
+from utils.logger import setup_logger
+from utils.rate_limiter import TokenBucket, backoff_delay, get_sec_rate_limiter
+from config.settings import settings
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUSES = {429, 503}
+
+
+@dataclass
+class FetchResponse:
+    """Result of a single EDGAR request"""
+    url: str
+    status: int
+    body: Optional[bytes] = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    from_cache: bool = False
+    path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and (self.body is not None or self.path is not None)
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+class EdgarFetcher:
+    """Asyncio EDGAR client with a shared keep-alive connection pool.
+
+    The fetcher owns a background event loop so that synchronous callers
+    (CrewAI tools) can submit batches of requests while the underlying
+    aiohttp session, and its pooled connections, stays warm between calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[HTTPCache] = None,
+        user_agent: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.SEC_MAX_CONCURRENCY
+        self.rate_limiter = rate_limiter or get_sec_rate_limiter()
+        self.cache = cache if cache is not None else get_http_cache()
+        self.user_agent = user_agent or settings.SEC_USER_AGENT
+        self.timeout = timeout or settings.SEC_REQUEST_TIMEOUT
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Event loop management
+    # ------------------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="edgar-fetcher", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the fetcher's event loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro) -> Any:
+        """Run a coroutine on the fetcher's event loop and wait for its result"""
+        return self.submit(coro).result()
+
+    def close(self) -> None:
+        """Close the connection pool and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    # ------------------------------------------------------------------
+    # Async API (runs on the fetcher's loop)
+    # ------------------------------------------------------------------
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.max_concurrency,
+                keepalive_timeout=30,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'User-Agent': self.user_agent,
+                    'Accept-Encoding': 'gzip, deflate',
+                },
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResponse:
+        """Fetch a single URL, serving unchanged documents from the HTTP cache.
+
+        Cached URLs are revalidated with If-None-Match / If-Modified-Since;
+        a 304 answer returns the stored body with `from_cache` set.
+        """
+        if self.cache is None:
+            return await self._fetch(url, headers)
+
+        conditional = self.cache.conditional_headers(url)
+        response = await self._fetch(url, {**(headers or {}), **conditional})
+        if response.status == 304:
+            body = self.cache.load(url)
+            if body is not None:
+                return FetchResponse(url=url, status=200, body=body, headers=response.headers, from_cache=True)
+            response = await self._fetch(url, headers)
+        if response.ok:
+            self.cache.store(url, response.body, response.headers)
+        return response
+
+    async def download(self, url: str, dest: Path) -> FetchResponse:
+        """Stream a (possibly large) document to `dest` without buffering it in memory"""
+        return await self._fetch(url, dest=dest)
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        dest: Optional[Path] = None,
+    ) -> FetchResponse:
+        """Fetch a single URL over the network, returning a FetchResponse instead of raising.
+
+        Every attempt draws from the shared rate limiter. HTTP 429/503 and
+        connection errors are retried with jittered exponential backoff, and
+        a Retry-After header pauses the whole bucket so that parallel workers
+        back off together. When `dest` is given, a 200 body is streamed to
+        that file in chunks and exposed as `path` rather than `body`.
+        """
+        session = await self._get_session()
+        response = FetchResponse(url=url, status=0)
+        async with self._semaphore:
+            for attempt in range(settings.SEC_MAX_RETRIES + 1):
+                await self.rate_limiter.acquire_async()
+                try:
+                    async with session.get(url, headers=headers) as http_response:
+                        response = FetchResponse(
+                            url=url,
+                            status=http_response.status,
+                            headers=CIMultiDict(http_response.headers),
+                        )
+                        if dest is not None and http_response.status == 200:
+                            with open(dest, 'wb') as f:
+                                async for chunk in http_response.content.iter_chunked(64 * 1024):
+                                    f.write(chunk)
+                            response.path = dest
+                        else:
+                            response.body = await http_response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    response = FetchResponse(url=url, status=0, error=str(e))
+
+                if response.status not in RETRYABLE_STATUSES and response.error is None:
+                    return response
+                if attempt == settings.SEC_MAX_RETRIES:
+                    break
+
+                delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+                if response.status in RETRYABLE_STATUSES:
+                    self.rate_limiter.pause(delay)
+                logger.warning(
+                    f"Retrying {url} in {delay:.1f}s "
+                    f"(status {response.status or response.error}, attempt {attempt + 1})"
+                )
+                await asyncio.sleep(delay)
+
+        logger.warning(f"Giving up on {url} after {settings.SEC_MAX_RETRIES + 1} attempts")
+        return response
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[FetchResponse]:
+        """Fetch many URLs concurrently, preserving input order"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    # ------------------------------------------------------------------
+    # Synchronous wrappers
+    # ------------------------------------------------------------------
+    def get(self, url: str) -> FetchResponse:
+        """Synchronously fetch a single URL"""
+        return self.run(self.fetch(url))
+
+    def download_sync(self, url: str, dest: Path) -> FetchResponse:
+        """Synchronously stream a document to disk"""
+        return self.run(self.download(url, dest))
+
+    def get_many(self, urls: Iterable[str]) -> List[FetchResponse]:
+        """Synchronously fetch many URLs over the shared connection pool"""
+        return self.run(self.fetch_all(list(urls)))
+
+    def get_json_many(self, urls: Iterable[str]) -> Dict[str, Any]:
+        """Fetch many JSON documents; failed or non-200 URLs map to None"""
+        results = {}
+        for response in self.get_many(urls):
+            try:
+                results[response.url] = response.json() if response.ok else None
+            except ValueError as e:
+                logger.warning(f"Invalid JSON from {response.url}: {e}")
+                results[response.url] = None
+        return results
+
+
+_fetcher: Optional[EdgarFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> EdgarFetcher:
+    """Return the process-wide EDGAR fetcher"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = EdgarFetcher()
+            atexit.register(_fetcher.close)
+        return _fetcher
@@ -1,124 +1,120 @@
-import requests
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from crewai_tools import BaseTool
-from pydantic import BaseModel, Field
-import json
-import time
+from itertools import islice
 from utils.logger import setup_logger
 from config.settings import settings
+from tools.sec_fetcher import get_fetcher
+from tools.edgar_index import iter_recent_filings
+from tools.form4_parser import FORM4_TYPES
+from tools.form4_pipeline import fetch_and_parse
+from data.storage import DataStorage
+from data.artifact_store import publish
 
 logger = setup_logger(__name__)
 
 class SECFilingsTool(BaseTool):
     name: str = "SEC Filings Tool"
-    description: str = "Retrieves SEC filings data for the last 24 hours"
+    description: str = (
+        "Retrieves SEC filings data for the last 24 hours. Returns an artifact handle "
+        "for the full data plus a summary; pass the handle to other tools."
+    )
     
     def _run(self, hours_back: int = 24) -> str:
         """Fetch SEC filings from the last specified hours"""
         try:
-            headers = {
-                'User-Agent': settings.SEC_USER_AGENT,
-                'Accept': 'application/json'
-            }
-            
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(hours=hours_back)
-            
-            # SEC submissions endpoint
-            url = f"{settings.SEC_EDGAR_URL}/submissions/CIK{10000:010d}.json"
-            
-            # Get recent filings
-            filings = []
-            for cik in range(1, 100):  # Sample range of CIKs
-                try:
-                    cik_url = f"{settings.SEC_EDGAR_URL}/submissions/CIK{cik:010d}.json"
-                    response = requests.get(cik_url, headers=headers)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        recent_filings = data.get('filings', {}).get('recent', {})
-                        
-                        if recent_filings:
-                            forms = recent_filings.get('form', [])
-                            dates = recent_filings.get('filingDate', [])
-                            
-                            for i, (form, date) in enumerate(zip(forms, dates)):
-                                filing_date = datetime.strptime(date, '%Y-%m-%d')
-                                if start_date <= filing_date <= end_date:
-                                    filings.append({
-                                        'cik': cik,
-                                        'form': form,
-                                        'filing_date': date,
-                                        'company': data.get('name', 'Unknown')
-                                    })
-                    
-                    time.sleep(0.1)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.warning(f"Error fetching CIK {cik}: {e}")
-                    continue
-                    
-                if len(filings) >= 50:  # Limit for demo
-                    break
-            
-            logger.info(f"Retrieved {len(filings)} SEC filings")
-            return json.dumps(filings, indent=2)
+            filings = self.get_filings(hours_back)
+            return publish('sec_filings', filings)
             
         except Exception as e:
             logger.error(f"Error fetching SEC filings: {e}")
             return f"Error: {str(e)}"
+    
+    def get_filings(self, hours_back: int = 24) -> List[Dict[str, Any]]:
+        """Return SEC filings from the last specified hours as Python data"""
+        if settings.SEC_INGEST_MODE == "index":
+            # One index download per day instead of one request per company
+            filings = list(islice(iter_recent_filings(hours_back), 50))  # Limit for demo
+        else:
+            filings = self._probe_submissions(hours_back)
+        
+        logger.info(f"Retrieved {len(filings)} SEC filings")
+        return filings
+    
+    def _probe_submissions(self, hours_back: int) -> List[Dict[str, Any]]:
+        """Find recent filings by probing the submissions JSON of a sample range of CIKs"""
+        # Calculate date range
+        end_date = datetime.now()
+        start_date = end_date - timedelta(hours=hours_back)
+        
+        # Fetch submissions for a sample range of CIKs over the shared pool
+        cik_urls = {
+            cik: f"{settings.SEC_EDGAR_URL}/submissions/CIK{cik:010d}.json"
+            for cik in range(1, 100)
+        }
+        submissions = get_fetcher().get_json_many(cik_urls.values())
+        
+        # Get recent filings
+        filings = []
+        for cik, cik_url in cik_urls.items():
+            try:
+                data = submissions.get(cik_url)
+                
+                if data:
+                    recent_filings = data.get('filings', {}).get('recent', {})
+                    
+                    if recent_filings:
+                        forms = recent_filings.get('form', [])
+                        dates = recent_filings.get('filingDate', [])
+                        
+                        for i, (form, date) in enumerate(zip(forms, dates)):
+                            filing_date = datetime.strptime(date, '%Y-%m-%d')
+                            if start_date <= filing_date <= end_date:
+                                filings.append({
+                                    'cik': cik,
+                                    'form': form,
+                                    'filing_date': date,
+                                    'company': data.get('name', 'Unknown')
+                                })
+                
+            except Exception as e:
+                logger.warning(f"Error processing CIK {cik}: {e}")
+                continue
+                
+            if len(filings) >= 50:  # Limit for demo
+                break
+        
+        return filings
 
 class InsiderTradingTool(BaseTool):
     name: str = "Insider Trading Tool"
-    description: str = "Retrieves insider trading activity from SEC Form 4 filings"
+    description: str = (
+        "Retrieves insider trading activity from SEC Form 4 filings. Returns an artifact "
+        "handle for the full data plus a summary; pass the handle to other tools."
+    )
     
     def _run(self, hours_back: int = 24) -> str:
         """Fetch insider trading data from Form 4 filings"""
         try:
-            headers = {
-                'User-Agent': settings.SEC_USER_AGENT,
-                'Accept': 'application/json'
-            }
-            
-            # Form 4 filings endpoint
-            url = f"{settings.SEC_EDGAR_URL}/api/xbrl/companyfacts/CIK0000320193.json"
+            insider_trades = self.get_trades(hours_back)
             
-            insider_trades = []
+            # Persist so the daily/weekly rollups used by charts and reports stay current
+            DataStorage().bulk_upsert_trades(insider_trades)
             
-            # Sample insider trading data (in real implementation, parse Form 4 XML files)
-            sample_trades = [
-                {
-                    'company': 'Apple Inc.',
-                    'ticker': 'AAPL',
-                    'insider_name': 'Tim Cook',
-                    'title': 'CEO',
-                    'transaction_date': datetime.now().strftime('%Y-%m-%d'),
-                    'transaction_type': 'Sale',
-                    'shares': 50000,
-                    'price': 185.50,
-                    'value': 9275000
-                },
-                {
-                    'company': 'Microsoft Corporation',
-                    'ticker': 'MSFT',
-                    'insider_name': 'Satya Nadella',
-                    'title': 'CEO',
-                    'transaction_date': (datetime.now() - timedelta(hours=12)).strftime('%Y-%m-%d'),
-                    'transaction_type': 'Sale',
-                    'shares': 25000,
-                    'price': 420.00,
-                    'value': 10500000
-                }
-            ]
-            
-            insider_trades.extend(sample_trades)
-            
-            logger.info(f"Retrieved {len(insider_trades)} insider trading records")
-            return json.dumps(insider_trades, indent=2)
+            return publish('insider_trades', insider_trades)
             
         except Exception as e:
             logger.error(f"Error fetching insider trading data: {e}")
-            return f"Error: {str(e)}"
\ No newline at end of file
+            return f"Error: {str(e)}"
+    
+    def get_trades(self, hours_back: int = 24) -> List[Dict[str, Any]]:
+        """Return parsed Form 4 trades from the last specified hours as Python data"""
+        # Locate Form 4/4A filings in the EDGAR indexes
+        max_filings = settings.FORM4_MAX_FILINGS or None
+        filings = list(islice(iter_recent_filings(hours_back, forms=FORM4_TYPES), max_filings))
+        
+        # Download and parse concurrently; parsing runs in a process pool
+        insider_trades = list(fetch_and_parse(filings))
+        
+        logger.info(f"Retrieved {len(insider_trades)} insider trading records from {len(filings)} filings")
+        return insider_trades
\ No newline at end of file
@@ -0,0 +1,13 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from utils.logger import init_worker_logging
+
+
+def make_executor(workers: int) -> Executor:
+    """A process pool for CPU-bound work, or a single thread when workers is 0.
+
+    Worker processes restart log output on startup, so warnings they log
+    end up in the console and log file like the parent's.
+    """
+    if workers <= 0:
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker_logging)
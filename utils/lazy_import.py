@@ -0,0 +1,45 @@
+import importlib
+import threading
+import time
+import types
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported the first time one of its attributes is used.
+
+    Heavy libraries (pandas, plotly, crewai, litellm) take seconds to
+    import, so modules that only need them on some code paths bind them
+    at module level through lazy_import() instead of a plain import.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                logger.debug(f"Imported {self.__name__} on first use in {time.perf_counter() - started:.2f}s")
+                self.__dict__['_lazy_module'] = module
+            return self._lazy_module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module `name` that defers the import until first attribute access"""
+    return LazyModule(name)
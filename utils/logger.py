@@ -1,12 +1,21 @@
+import atexit
+import json
 import logging
+import multiprocessing.util
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
 from config.settings import settings
 
+TEXT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
 class CustomFormatter(logging.Formatter):
     """Custom formatter with colors for different log levels"""
-    
+
     COLORS = {
         'DEBUG': '\033[36m',    # Cyan
         'INFO': '\033[32m',     # Green
@@ -15,35 +24,155 @@ class CustomFormatter(logging.Formatter):
         'CRITICAL': '\033[35m', # Magenta
     }
     RESET = '\033[0m'
-    
+
+    def __init__(self, fmt: str = TEXT_LOG_FORMAT):
+        super().__init__(fmt)
+        # One formatter per level with the colored name baked in, so records are never modified
+        self.formatters = {
+            level: logging.Formatter(fmt.replace('%(levelname)s', f"{color}{level}{self.RESET}"))
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record):
-        log_color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{log_color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        formatter = self.formatters.get(record.levelname)
+        return formatter.format(record) if formatter else super().format(record)
+
+class JSONFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeated warnings from the same call site beyond a burst per time window.
+
+    The first record of the next window reports how many were suppressed.
+    Errors and lower levels than WARNING are always passed through.
+    """
+
+    def __init__(self, burst: Optional[int] = None, window: Optional[float] = None):
+        super().__init__()
+        self.burst = settings.LOG_WARNING_BURST if burst is None else burst
+        self.window = window or settings.LOG_WARNING_WINDOW
+        # (logger, file, line) -> [window start, records in window, suppressed]
+        self._sites: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno != logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        key = (record.name, record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar warnings suppressed)"
+            record.args = None
+        return True
+
+class _PreparedQueueHandler(QueueHandler):
+    """Queue handler that renders the message in the calling thread but leaves formatting to the listener"""
+
+    def prepare(self, record):
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_handler_lock = threading.Lock()
+
+def _build_handlers():
+    """Console and file handlers, run on the listener thread"""
+    log_file = settings.BASE_DIR / f"logs_{datetime.now().strftime('%Y%m%d')}.log"
+    console_handler = logging.StreamHandler(sys.stdout)
+    file_handler = logging.FileHandler(log_file)
+
+    if settings.LOG_FORMAT == "json":
+        console_handler.setFormatter(JSONFormatter())
+        file_handler.setFormatter(JSONFormatter())
+    else:
+        console_handler.setFormatter(CustomFormatter())
+        file_handler.setFormatter(logging.Formatter(TEXT_LOG_FORMAT))
+    return console_handler, file_handler
+
+def get_queue_handler() -> QueueHandler:
+    """Shared handler that hands records to the single background listener"""
+    global _queue_handler, _listener
+
+    with _handler_lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            _listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=False)
+            _listener.start()
+            atexit.register(stop_logging)
+
+            _queue_handler = _PreparedQueueHandler(log_queue)
+            _queue_handler.addFilter(RateLimitFilter())
+        return _queue_handler
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+
+    with _handler_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+def init_worker_logging():
+    """Restart log output in a worker process.
+
+    A forked worker inherits the queue handler but not the listener thread,
+    so its records would never be written. The handler gets a fresh queue
+    and its own listener, stopped when the worker exits.
+    """
+    global _listener
+
+    with _handler_lock:
+        if _queue_handler is None:
+            return
+        _queue_handler.queue = queue.SimpleQueue()
+        _listener = QueueListener(_queue_handler.queue, *_build_handlers(), respect_handler_level=False)
+        _listener.start()
+    # Pool workers leave through multiprocessing's exit hooks rather than atexit
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=0)
 
 def setup_logger(name: str = __name__) -> logging.Logger:
-    """Setup logger with custom formatting"""
+    """Setup logger with custom formatting.
+
+    Every logger shares one queue handler: log calls only enqueue the record,
+    and one listener thread does the console and file I/O.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, settings.LOG_LEVEL))
-    
+
     if not logger.handlers:
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG)
-        console_formatter = CustomFormatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-        
-        # File handler
-        log_file = settings.BASE_DIR / f"logs_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-    
-    return logger
\ No newline at end of file
+        logger.addHandler(get_queue_handler())
+
+    return logger
@@ -0,0 +1,116 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from config.settings import settings
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be shared across threads and event loops.
+
+    Callers reserve a token up front and are told how long to wait before
+    using it, so concurrent workers queue fairly behind one budget instead
+    of busy-polling the lock. A pause moves back every reservation that has
+    not been spent yet, not just the ones made after it.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # Total time by which pauses have pushed back reservations already handed out
+        self._shift = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _reserve(self) -> Tuple[float, float]:
+        """Take one token and return the delay before it may be spent, with the current shift"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            deficit = -self._tokens if self._tokens < 0 else 0.0
+            return (self._updated - now) + deficit / self.rate, self._shift
+
+    def _shifted_since(self, shift: float) -> Tuple[float, float]:
+        """Extra delay added by pauses since `shift` was read, with the current shift"""
+        with self._lock:
+            return self._shift - shift, self._shift
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available"""
+        delay, shift = self._reserve()
+        while delay > 0:
+            time.sleep(delay)
+            delay, shift = self._shifted_since(shift)
+
+    async def acquire_async(self) -> None:
+        """Wait on the running event loop until a token is available"""
+        delay, shift = self._reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay, shift = self._shifted_since(shift)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds (e.g. after a 429).
+
+        Callers still waiting on a reservation are pushed back by the same
+        amount, keeping their spacing, so none of them is sent inside the
+        pause window.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            resume_at = now + seconds
+            if resume_at > self._updated:
+                self._shift += resume_at - self._updated
+                self._updated = resume_at
+                # One request may go out when the pause ends, but no burst
+                self._tokens = min(self._tokens, 1.0)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Delay before retry number `attempt` (0-based), honouring Retry-After when present"""
+    server_delay = parse_retry_after(retry_after)
+    if server_delay is not None:
+        return min(server_delay, settings.SEC_BACKOFF_MAX)
+    ceiling = min(settings.SEC_BACKOFF_MAX, settings.SEC_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+_sec_rate_limiter: Optional[TokenBucket] = None
+_sec_rate_limiter_lock = threading.Lock()
+
+
+def get_sec_rate_limiter() -> TokenBucket:
+    """Return the process-wide token bucket used for all SEC HTTP calls"""
+    global _sec_rate_limiter
+    with _sec_rate_limiter_lock:
+        if _sec_rate_limiter is None:
+            _sec_rate_limiter = TokenBucket(settings.SEC_REQUESTS_PER_SECOND, settings.SEC_RATE_BURST)
+        return _sec_rate_limiter
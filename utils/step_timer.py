@@ -0,0 +1,69 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StepTimer:
+    """Records when each flow step starts and ends, relative to the start of the run.
+
+    Steps declare the steps they waited for, so after a run the timer can
+    walk back from the last step to find the critical path: the chain of
+    dependencies that determined the end-to-end latency.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, Tuple[float, float]] = {}
+        self.dependencies: Dict[str, Tuple[str, ...]] = {}
+
+    @contextmanager
+    def step(self, name: str, after: Iterable[str] = ()):
+        """Time the enclosed block as step `name`, which ran after the steps in `after`"""
+        self.dependencies[name] = tuple(after)
+        start = time.perf_counter() - self.started
+        try:
+            yield
+        finally:
+            end = time.perf_counter() - self.started
+            self.spans[name] = (start, end)
+            logger.info(f"Step {name} finished in {end - start:.2f}s")
+
+    def durations(self) -> Dict[str, float]:
+        return {name: end - start for name, (start, end) in self.spans.items()}
+
+    def critical_path(self) -> List[str]:
+        """Steps on the longest dependency chain, in execution order"""
+        if not self.spans:
+            return []
+        path = []
+        name = max(self.spans, key=lambda step: self.spans[step][1])
+        while name:
+            path.append(name)
+            waited_for = [dep for dep in self.dependencies.get(name, ()) if dep in self.spans]
+            name = max(waited_for, key=lambda step: self.spans[step][1]) if waited_for else None
+        return path[::-1]
+
+    def summary(self) -> Dict[str, object]:
+        durations = self.durations()
+        wall = max((end for _, end in self.spans.values()), default=0.0)
+        path = self.critical_path()
+        return {
+            "steps": durations,
+            "critical_path": path,
+            "critical_path_seconds": sum(durations[name] for name in path),
+            "wall_seconds": wall,
+            "serial_seconds": sum(durations.values()),
+        }
+
+    def log_summary(self) -> Dict[str, object]:
+        summary = self.summary()
+        logger.info(
+            f"Flow finished in {summary['wall_seconds']:.2f}s "
+            f"(steps total {summary['serial_seconds']:.2f}s); "
+            f"critical path: {' -> '.join(summary['critical_path'])} "
+            f"({summary['critical_path_seconds']:.2f}s)"
+        )
+        return summary